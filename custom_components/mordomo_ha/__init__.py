@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import json
 import logging
+from collections import Counter
 from typing import Any
 
+import orjson
 from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
@@ -88,6 +90,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except Exception as err:
         _LOGGER.error("Failed to create LLM provider: %s", err)
         return False
+    llm.enable_persistence(hass, entry.entry_id)
 
     # Build webhook URL for the bridge to forward messages to
     webhook_id = f"{WEBHOOK_ID_PREFIX}{entry.entry_id}"
@@ -178,6 +181,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                     )
 
     cmd_processor = CommandProcessor(hass)
+    llm.set_context_provider(cmd_processor.get_ha_context)
 
     # Initialize scheduler
     scheduler = MordomoScheduler(hass)
@@ -223,10 +227,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         dashboard = mordomo_data.get("dashboard")
         if dashboard:
             await dashboard.async_save()
+        # Close the LLM provider's HTTP session and flush history writes
+        await mordomo_data["llm"].close()
         # Stop Baileys bridge
         wa_inst = mordomo_data.get("whatsapp")
         if hasattr(wa_inst, "stop_bridge"):
             await wa_inst.stop_bridge()
+        elif hasattr(wa_inst, "close"):
+            await wa_inst.close()
 
     entry.async_on_unload(
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _shutdown)
@@ -251,10 +259,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await scheduler.async_save()
         await scheduler.async_unload()
 
-    # Stop bridge if running
+    # Stop listening for registry updates
+    cmd_processor = data.get("command_processor")
+    if cmd_processor:
+        cmd_processor.home_awareness.async_unload()
+
+    # Close the LLM provider's HTTP session
+    llm = data.get("llm")
+    if llm:
+        await llm.close()
+
+    # Stop bridge if running, or close the external gateway's HTTP session
     wa = data.get("whatsapp")
     if wa and hasattr(wa, "stop_bridge"):
         await wa.stop_bridge()
+    elif wa and hasattr(wa, "close"):
+        await wa.close()
 
     # Unregister services to avoid duplicate registrations on reload
     for svc in (SERVICE_SEND_MESSAGE, SERVICE_CREATE_AUTOMATION,
@@ -272,7 +292,7 @@ def _create_webhook_handler(hass: HomeAssistant, entry_id: str):
     ):
         """Handle incoming WhatsApp webhook."""
         try:
-            data = await request.json()
+            data = orjson.loads(await request.read())
         except Exception:
             _LOGGER.error("Failed to parse webhook JSON")
             return
@@ -323,7 +343,7 @@ def _create_webhook_handler(hass: HomeAssistant, entry_id: str):
 
         # Special commands
         if message.strip().lower() in ("/reset", "/limpar", "/clear"):
-            llm.clear_history(sender)
+            await llm.clear_history(sender)
             await wa.send_message(sender, "Historico de conversa limpo!")
             return
 
@@ -406,12 +426,9 @@ def _create_webhook_handler(hass: HomeAssistant, entry_id: str):
                 await wa.send_message(sender, "Indica o nome da divisao. Ex: /divisao Sala")
             return
 
-        # Get HA context for the LLM
-        ha_context = await cmd_processor.get_ha_context()
-
-        # Send to LLM
+        # Send to LLM (it fetches the HA context through its context provider)
         try:
-            response = await llm.chat(message, system_prompt, sender, ha_context)
+            response = await llm.chat(message, system_prompt, sender)
         except Exception as err:
             _LOGGER.error("LLM error: %s", err)
             await wa.send_message(
@@ -433,8 +450,9 @@ def _create_webhook_handler(hass: HomeAssistant, entry_id: str):
             results = await cmd_processor.execute_commands(commands)
 
             if dashboard:
-                for cmd in commands:
-                    dashboard.log_command(cmd.get("action", ""))
+                dashboard.log_commands_bulk(
+                    Counter(cmd.get("action", "") for cmd in commands)
+                )
 
             if results:
                 result_text = "\n".join(results)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
@@ -11,6 +12,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 
 from .home_awareness import HomeAwareness
+from .scheduler import is_valid_cron
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -106,41 +108,49 @@ class CommandProcessor:
 
         return clean_text, commands
 
-    async def execute_commands(self, commands: list[dict]) -> list[str]:
-        """Execute a list of commands and return results."""
-        results = []
-        for cmd in commands:
-            try:
-                action = cmd.get("action", "")
-                if action == "call_service":
-                    result = await self._call_service(cmd)
-                elif action == "get_state":
-                    result = await self._get_state(cmd)
-                elif action == "get_states":
-                    result = await self._get_states(cmd)
-                elif action == "get_area":
-                    result = await self._get_area(cmd)
-                elif action == "get_areas":
-                    result = await self._get_areas()
-                elif action == "get_house_summary":
-                    result = await self._get_house_summary()
-                elif action == "create_automation":
-                    result = await self._create_automation(cmd)
-                elif action == "schedule_job":
-                    result = await self._schedule_job(cmd)
-                elif action == "remove_job":
-                    result = await self._remove_job(cmd)
-                elif action == "list_entities":
-                    result = await self._list_entities(cmd)
-                else:
-                    result = f"Acao desconhecida: {action}"
-
-                results.append(result)
-            except Exception as err:
-                _LOGGER.error("Command execution error: %s", err)
-                results.append(f"Erro ao executar comando: {err}")
+    async def execute_commands(
+        self, commands: list[dict], parallel: bool = False
+    ) -> list[str]:
+        """Execute a list of commands and return results.
 
-        return results
+        With parallel=True the commands run concurrently; only use it for
+        commands that do not depend on each other, e.g. scheduled jobs.
+        """
+        if parallel:
+            return list(await asyncio.gather(
+                *(self._execute_command(cmd) for cmd in commands)
+            ))
+        return [await self._execute_command(cmd) for cmd in commands]
+
+    async def _execute_command(self, cmd: dict) -> str:
+        """Execute a single command and return its result."""
+        try:
+            action = cmd.get("action", "")
+            if action == "call_service":
+                return await self._call_service(cmd)
+            elif action == "get_state":
+                return await self._get_state(cmd)
+            elif action == "get_states":
+                return await self._get_states(cmd)
+            elif action == "get_area":
+                return await self._get_area(cmd)
+            elif action == "get_areas":
+                return await self._get_areas()
+            elif action == "get_house_summary":
+                return await self._get_house_summary()
+            elif action == "create_automation":
+                return await self._create_automation(cmd)
+            elif action == "schedule_job":
+                return await self._schedule_job(cmd)
+            elif action == "remove_job":
+                return await self._remove_job(cmd)
+            elif action == "list_entities":
+                return await self._list_entities(cmd)
+            else:
+                return f"Acao desconhecida: {action}"
+        except Exception as err:
+            _LOGGER.error("Command execution error: %s", err)
+            return f"Erro ao executar comando: {err}"
 
     async def _call_service(self, cmd: dict) -> str:
         """Call a Home Assistant service."""
@@ -315,6 +325,8 @@ class CommandProcessor:
 
         if not cron_expr:
             return "Erro: expressao cron e obrigatoria."
+        if not is_valid_cron(cron_expr):
+            return f"Erro: expressao cron invalida '{cron_expr}'."
 
         self.hass.bus.async_fire(
             "mordomo_ha_schedule_job",
@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import logging
 import os
-from collections import deque
+from collections import Counter, deque
 from typing import Any
 
+import voluptuous as vol
 from aiohttp import web
 
-from homeassistant.components import frontend
+from homeassistant.components import frontend, websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
@@ -25,6 +32,10 @@ MAX_MESSAGES = 500
 
 PANEL_URL = "/mordomo-ha-panel"
 
+# Dispatcher signal carrying new message-log entries to live panel subscribers.
+# Not tied to a DashboardData instance, so subscriptions survive entry reloads.
+SIGNAL_DASHBOARD_EVENT = f"{DOMAIN}_dashboard_event"
+
 
 class DashboardData:
     """Manages dashboard state: message log, stats, etc."""
@@ -34,6 +45,9 @@ class DashboardData:
         self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
         self.messages: deque[dict] = deque(maxlen=MAX_MESSAGES)
         self._msg_counter = 0
+        # Serializes snapshot+save so concurrent webhook handlers never
+        # persist a half-updated stats dict or interleave store writes.
+        self._lock = asyncio.Lock()
         self.stats = {
             "total_messages_in": 0,
             "total_messages_out": 0,
@@ -50,8 +64,7 @@ class DashboardData:
         """Load stored data."""
         data = await self._store.async_load()
         if data:
-            for msg in data.get("messages", []):
-                self.messages.append(msg)
+            self.messages.extend(data.get("messages", []))
             stored_stats = data.get("stats", {})
             self.stats["total_messages_in"] = stored_stats.get("total_messages_in", 0)
             self.stats["total_messages_out"] = stored_stats.get("total_messages_out", 0)
@@ -67,58 +80,73 @@ class DashboardData:
 
     async def async_save(self):
         """Persist data."""
-        data = {
-            "messages": list(self.messages),
-            "stats": {
-                **self.stats,
-                "unique_users": list(self.stats["unique_users"]),
-            },
+        async with self._lock:
+            data = {
+                "messages": list(self.messages),
+                "stats": {
+                    **self.stats,
+                    "unique_users": list(self.stats["unique_users"]),
+                },
+            }
+            await self._store.async_save(data)
+
+    def _log(self, direction: str, phone: str, text: str, *, _now=dt_util.now) -> dict:
+        """Append a message-log entry and bump the matching counter."""
+        stats = self.stats
+        timestamp = _now().isoformat()
+        self._msg_counter += 1
+        msg = {
+            "id": self._msg_counter,
+            "direction": direction,
+            "phone": phone,
+            "text": text,
+            "timestamp": timestamp,
         }
-        await self._store.async_save(data)
+        self.messages.append(msg)
+        if direction == "in":
+            stats["total_messages_in"] += 1
+            stats["last_message_at"] = timestamp
+            stats["unique_users"].add(phone)
+        else:
+            stats["total_messages_out"] += 1
+        self._notify(msg)
+        return msg
 
     def log_incoming(self, sender: str, message: str):
         """Log an incoming message."""
-        self._msg_counter += 1
-        self.messages.append({
-            "id": self._msg_counter,
-            "direction": "in",
-            "phone": sender,
-            "text": message,
-            "timestamp": dt_util.now().isoformat(),
-        })
-        self.stats["total_messages_in"] += 1
-        self.stats["last_message_at"] = dt_util.now().isoformat()
-        self.stats["unique_users"].add(sender)
+        self._log("in", sender, message)
 
     def log_outgoing(self, recipient: str, message: str):
         """Log an outgoing message."""
-        self._msg_counter += 1
-        self.messages.append({
-            "id": self._msg_counter,
-            "direction": "out",
-            "phone": recipient,
-            "text": message,
-            "timestamp": dt_util.now().isoformat(),
-        })
-        self.stats["total_messages_out"] += 1
+        self._log("out", recipient, message)
 
     def log_command(self, command_type: str = ""):
         """Log a command execution."""
-        self.stats["total_commands"] += 1
-        if command_type == "create_automation":
-            self.stats["total_automations_created"] += 1
-        elif command_type == "schedule_job":
-            self.stats["total_jobs_scheduled"] += 1
+        self.log_commands_bulk(Counter((command_type,)))
+
+    def log_commands_bulk(self, counter: Counter):
+        """Log a batch of command executions, counted by action type."""
+        self.stats["total_commands"] += sum(counter.values())
+        self.stats["total_automations_created"] += counter["create_automation"]
+        self.stats["total_jobs_scheduled"] += counter["schedule_job"]
 
     def log_error(self):
         """Log an error."""
         self.stats["errors"] += 1
 
+    def _notify(self, msg: dict):
+        """Push a new message-log entry to every live subscriber."""
+        async_dispatcher_send(
+            self.hass, SIGNAL_DASHBOARD_EVENT, {"type": "message", "message": msg}
+        )
+
     def get_messages(self, limit: int = 100, phone: str = "") -> list[dict]:
         """Get recent messages, optionally filtered by phone."""
-        msgs = list(self.messages)
-        if phone:
-            msgs = [m for m in msgs if m.get("phone") == phone]
+        if not phone:
+            # Walk only the tail we return instead of copying the whole log
+            n = len(self.messages)
+            return list(itertools.islice(self.messages, max(0, n - limit), n))
+        msgs = [m for m in self.messages if m.get("phone") == phone]
         return msgs[-limit:]
 
     def get_stats(self) -> dict:
@@ -133,6 +161,7 @@ class DashboardData:
 # -- Module-level guards: panel/views survive HA config entry reloads --
 _PANEL_REGISTERED = False
 _VIEWS_REGISTERED = False
+_WS_REGISTERED = False
 
 
 async def setup_panel(hass: HomeAssistant, entry_id: str):
@@ -142,7 +171,7 @@ async def setup_panel(hass: HomeAssistant, entry_id: str):
     lifetime of the HA process - they cannot be unregistered and re-registered
     without a full restart, so we guard with a module-level flag.
     """
-    global _PANEL_REGISTERED, _VIEWS_REGISTERED  # noqa: PLW0603
+    global _PANEL_REGISTERED, _VIEWS_REGISTERED, _WS_REGISTERED  # noqa: PLW0603
 
     mordomo = hass.data.get(DOMAIN, {}).get(entry_id)
     if not mordomo:
@@ -189,6 +218,11 @@ async def setup_panel(hass: HomeAssistant, entry_id: str):
     else:
         _LOGGER.debug("Mordomo HA views already registered; skipping")
 
+    # -- WebSocket push channel - register only once per process lifetime --
+    if not _WS_REGISTERED:
+        websocket_api.async_register_command(hass, websocket_subscribe)
+        _WS_REGISTERED = True
+
 
 def _get_mordomo(hass: HomeAssistant) -> dict:
     """Helper: get the active mordomo data dict."""
@@ -197,6 +231,23 @@ def _get_mordomo(hass: HomeAssistant) -> dict:
     return domain_data.get(entry_id, {})
 
 
+@websocket_api.websocket_command({vol.Required("type"): "mordomo_ha/subscribe"})
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+):
+    """Subscribe the panel to live message-log events."""
+
+    @callback
+    def _forward(event: dict):
+        connection.send_message(websocket_api.event_message(msg["id"], event))
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_DASHBOARD_EVENT, _forward
+    )
+    connection.send_result(msg["id"])
+
+
 # ----------------------------------------------------------------------
 # All views inherit from HomeAssistantView which provides:
 #   - .register() method required by hass.http.register_view()
@@ -276,9 +327,15 @@ class MordomoApiStats(HomeAssistantView):
         # Add live info
         scheduler = mordomo.get("scheduler")
         if scheduler:
-            jobs = scheduler.get_jobs()
-            stats["active_jobs"] = len([j for j in jobs if j.enabled])
-            stats["jobs"] = [j.to_dict() for j in jobs]
+            # Single pass: count enabled jobs while serializing
+            active = 0
+            job_dicts = []
+            for j in scheduler.get_jobs():
+                if j.enabled:
+                    active += 1
+                job_dicts.append(j.to_dict())
+            stats["active_jobs"] = active
+            stats["jobs"] = job_dicts
 
         # Connection status
         stats["whatsapp_gateway"] = mordomo.get("config", {}).get("whatsapp_gateway", "unknown")
@@ -316,12 +373,9 @@ class MordomoApiChat(HomeAssistantView):
         if dashboard:
             dashboard.log_incoming("dashboard", message)
 
-        # Get HA context
-        ha_context = await cmd_processor.get_ha_context()
-
-        # Send to LLM
+        # Send to LLM (it fetches the HA context through its context provider)
         try:
-            response = await llm.chat(message, system_prompt, "dashboard", ha_context)
+            response = await llm.chat(message, system_prompt, "dashboard")
         except Exception as err:
             _LOGGER.error("Dashboard chat LLM error: %s", err)
             return self.json({"error": str(err)}, status_code=500)
@@ -334,8 +388,9 @@ class MordomoApiChat(HomeAssistantView):
             results = await cmd_processor.execute_commands(commands)
             command_results = results
             if dashboard:
-                for cmd in commands:
-                    dashboard.log_command(cmd.get("action", ""))
+                dashboard.log_commands_bulk(
+                    Counter(cmd.get("action", "") for cmd in commands)
+                )
 
         # Log outgoing
         if dashboard:
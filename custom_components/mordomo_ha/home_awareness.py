@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import io
 import logging
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable, Iterator
 
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
 from homeassistant.helpers import (
     area_registry as ar,
     device_registry as dr,
@@ -36,14 +38,370 @@ DOMAIN_CATEGORIES = {
     "outros": [],
 }
 
+# Reverse lookup: domain -> category (built once at import)
+DOMAIN_TO_CATEGORY = {
+    domain: category
+    for category, domains in DOMAIN_CATEGORIES.items()
+    for domain in domains
+}
+
+# Domains left out of the house context
+SKIP_DOMAINS = frozenset({
+    "persistent_notification", "zone", "sun", "weather",
+    "update", "button", "number", "select", "text",
+    "input_number", "input_select", "input_text", "input_datetime",
+    "scene", "group", "device_tracker", "person", "tts",
+    "stt", "conversation", "tag",
+})
+
 # Sensor types that are most relevant for context
-IMPORTANT_SENSOR_CLASSES = {
+IMPORTANT_SENSOR_CLASSES = frozenset({
     "temperature", "humidity", "illuminance", "power", "energy",
     "battery", "motion", "door", "window", "occupancy", "presence",
     "gas", "smoke", "moisture", "co", "co2", "pm25", "pm10",
     "voltage", "current", "pressure",
+})
+
+# Device classes kept in the compact summary
+SUMMARY_SENSOR_CLASSES = frozenset({
+    "temperature", "humidity", "power", "energy", "battery",
+})
+SUMMARY_BINARY_SENSOR_CLASSES = frozenset({
+    "door", "window", "motion", "occupancy", "smoke", "gas",
+})
+
+
+def _accept_any(state: State) -> bool:
+    return True
+
+
+def _reject(state: State) -> bool:
+    return False
+
+
+def _accept_important_sensor(state: State) -> bool:
+    """Keep sensors with an important device class, or numeric ones without one."""
+    device_class = state.attributes.get("device_class")
+    if device_class:
+        return device_class in IMPORTANT_SENSOR_CLASSES
+    return bool(state.attributes.get("unit_of_measurement"))
+
+
+def _accept_summary_sensor(state: State) -> bool:
+    return state.attributes.get("device_class") in SUMMARY_SENSOR_CLASSES
+
+
+def _accept_summary_binary_sensor(state: State) -> bool:
+    return state.attributes.get("device_class") in SUMMARY_BINARY_SENSOR_CLASSES
+
+
+# Per-domain filters: full context accepts unlisted domains,
+# the summary rejects them.
+FULL_CONTEXT_FILTERS: dict[str, Callable[[State], bool]] = {
+    **{domain: _reject for domain in SKIP_DOMAINS},
+    "sensor": _accept_important_sensor,
+}
+SUMMARY_FILTERS: dict[str, Callable[[State], bool]] = {
+    "light": _accept_any,
+    "climate": _accept_any,
+    "cover": _accept_any,
+    "lock": _accept_any,
+    "alarm_control_panel": _accept_any,
+    "media_player": _accept_any,
+    "sensor": _accept_summary_sensor,
+    "binary_sensor": _accept_summary_binary_sensor,
+}
+
+
+# -- Per-domain formatters, dispatched by domain --------------------------
+# Each handler only writes keys whose value is not None.
+
+def _fmt_light(state: State, attrs, info: dict[str, Any]) -> None:
+    if state.state == "on":
+        get = attrs.get
+        brightness = get("brightness")
+        if brightness is not None:
+            info["brightness"] = round(brightness * 100 / 255)
+        color_temp = get("color_temp_kelvin")
+        if color_temp is not None:
+            info["color_temp_kelvin"] = color_temp
+        rgb_color = get("rgb_color")
+        if rgb_color is not None:
+            info["rgb_color"] = rgb_color
+
+
+def _fmt_climate(state: State, attrs, info: dict[str, Any]) -> None:
+    get = attrs.get
+    current_temp = get("current_temperature")
+    if current_temp is not None:
+        info["current_temp"] = current_temp
+    target_temp = get("temperature")
+    if target_temp is not None:
+        info["target_temp"] = target_temp
+    info["hvac_mode"] = state.state
+    hvac_action = get("hvac_action")
+    if hvac_action is not None:
+        info["hvac_action"] = hvac_action
+    humidity = get("humidity")
+    if humidity is not None:
+        info["humidity"] = humidity
+
+
+def _fmt_cover(state: State, attrs, info: dict[str, Any]) -> None:
+    position = attrs.get("current_position")
+    if position is not None:
+        info["position"] = position
+
+
+def _fmt_media_player(state: State, attrs, info: dict[str, Any]) -> None:
+    if state.state not in ("off", "unavailable", "unknown"):
+        get = attrs.get
+        media_title = get("media_title")
+        if media_title is not None:
+            info["media_title"] = media_title
+        media_artist = get("media_artist")
+        if media_artist is not None:
+            info["media_artist"] = media_artist
+        source = get("source")
+        if source is not None:
+            info["source"] = source
+        volume = get("volume_level")
+        if volume is not None:
+            info["volume"] = volume
+
+
+def _fmt_sensor(state: State, attrs, info: dict[str, Any]) -> None:
+    unit = attrs.get("unit_of_measurement", "")
+    if unit:
+        info["unit"] = unit
+    device_class = attrs.get("device_class", "")
+    if device_class:
+        info["device_class"] = device_class
+
+
+def _fmt_binary_sensor(state: State, attrs, info: dict[str, Any]) -> None:
+    device_class = attrs.get("device_class", "")
+    if device_class:
+        info["device_class"] = device_class
+
+
+def _fmt_alarm_control_panel(state: State, attrs, info: dict[str, Any]) -> None:
+    code_arm_required = attrs.get("code_arm_required")
+    if code_arm_required is not None:
+        info["code_arm_required"] = code_arm_required
+
+
+def _fmt_vacuum(state: State, attrs, info: dict[str, Any]) -> None:
+    battery = attrs.get("battery_level")
+    if battery is not None:
+        info["battery"] = battery
+    status = attrs.get("status")
+    if status is not None:
+        info["status"] = status
+
+
+def _fmt_fan(state: State, attrs, info: dict[str, Any]) -> None:
+    if state.state == "on":
+        speed = attrs.get("percentage")
+        if speed is not None:
+            info["speed"] = speed
+        preset_mode = attrs.get("preset_mode")
+        if preset_mode is not None:
+            info["preset_mode"] = preset_mode
+
+
+# Domains without a handler (e.g. lock) only need the state itself
+_FORMAT_STATE_HANDLERS: dict[str, Callable[[State, Any, dict[str, Any]], None]] = {
+    "light": _fmt_light,
+    "climate": _fmt_climate,
+    "cover": _fmt_cover,
+    "media_player": _fmt_media_player,
+    "sensor": _fmt_sensor,
+    "binary_sensor": _fmt_binary_sensor,
+    "alarm_control_panel": _fmt_alarm_control_panel,
+    "vacuum": _fmt_vacuum,
+    "fan": _fmt_fan,
+}
+
+_BINARY_SENSOR_LABELS = MappingProxyType({
+    "door": ("🚪 Aberta", "🚪 Fechada"),
+    "window": ("🪟 Aberta", "🪟 Fechada"),
+    "motion": ("🏃 Movimento", "✨ Sem movimento"),
+    "occupancy": ("👤 Ocupado", "Desocupado"),
+    "smoke": ("🚨 FUMO!", "OK"),
+    "gas": ("🚨 GÁS!", "OK"),
+    "moisture": ("💧 Húmido", "Seco"),
+    "lock": ("🔓 Destrancada", "🔒 Trancada"),
+})
+
+_ALARM_LABELS = MappingProxyType({
+    "armed_home": "🟢 Armado (casa)",
+    "armed_away": "🔴 Armado (fora)",
+    "armed_night": "🟡 Armado (noite)",
+    "disarmed": "⚪ Desarmado",
+    "triggered": "🚨 DISPARADO!",
+    "arming": "⏳ A armar...",
+    "pending": "⏳ Pendente...",
+})
+
+
+def _line_light(entity: dict) -> str:
+    if entity.get("state", "?") == "on":
+        brightness = entity.get("brightness")
+        return f"💡 ON ({brightness}%)" if brightness else "💡 ON"
+    return "OFF"
+
+
+def _line_climate(entity: dict) -> str:
+    current = entity.get("current_temp")
+    target = entity.get("target_temp")
+    action = entity.get("hvac_action", "")
+    return (
+        f"{entity.get('state', '?')}"
+        + (f" | atual: {current}°C" if current else "")
+        + (f" | alvo: {target}°C" if target else "")
+        + (f" | ({action})" if action else "")
+    )
+
+
+def _line_sensor(entity: dict) -> str:
+    unit = entity.get("unit", "")
+    return f"{entity.get('state', '?')} {unit}".strip()
+
+
+def _line_binary_sensor(entity: dict) -> str:
+    state = entity.get("state", "?")
+    device_class = entity.get("device_class", "")
+    if device_class in _BINARY_SENSOR_LABELS:
+        return _BINARY_SENSOR_LABELS[device_class][0 if state == "on" else 1]
+    return "ON" if state == "on" else "OFF"
+
+
+def _line_cover(entity: dict) -> str:
+    state = entity.get("state", "?")
+    position = entity.get("position")
+    return f"{state} ({position}%)" if position is not None else state
+
+
+def _line_lock(entity: dict) -> str:
+    return "🔒 Trancada" if entity.get("state", "?") == "locked" else "🔓 Destrancada"
+
+
+def _line_media_player(entity: dict) -> str:
+    state = entity.get("state", "?")
+    if state != "playing":
+        return state
+    title = entity.get("media_title", "")
+    if not title:
+        return "▶️ A reproduzir"
+    artist = entity.get("media_artist", "")
+    return f"▶️ {title} | por {artist}" if artist else f"▶️ {title}"
+
+
+def _line_vacuum(entity: dict) -> str:
+    battery = entity.get("battery")
+    status = entity.get("status", entity.get("state", "?"))
+    return f"{status} | 🔋 {battery}%" if battery else f"{status}"
+
+
+def _line_alarm_control_panel(entity: dict) -> str:
+    state = entity.get("state", "?")
+    return _ALARM_LABELS.get(state, state)
+
+
+# Each handler returns the middle segment of "name | ... | [entity_id]"
+_LINE_HANDLERS: dict[str, Callable[[dict], str]] = {
+    "light": _line_light,
+    "climate": _line_climate,
+    "sensor": _line_sensor,
+    "binary_sensor": _line_binary_sensor,
+    "cover": _line_cover,
+    "lock": _line_lock,
+    "media_player": _line_media_player,
+    "vacuum": _line_vacuum,
+    "alarm_control_panel": _line_alarm_control_panel,
+}
+
+
+def _compact_light(name: str, state: str, attrs) -> str:
+    if state != "on":
+        return f"{name}: OFF"
+    brightness = attrs.get("brightness")
+    if brightness is not None:
+        b = round(brightness * 100 / 255)
+        if b:
+            return f"{name}: ON {b}%"
+    return f"{name}: ON"
+
+
+def _compact_sensor(name: str, state: str, attrs) -> str:
+    return f"{name}: {state}{attrs.get('unit_of_measurement') or ''}"
+
+
+def _compact_binary_sensor(name: str, state: str, attrs) -> str:
+    dc = attrs.get("device_class")
+    if dc in ("door", "window"):
+        return f"{name}: {'ABERTO' if state == 'on' else 'FECHADO'}"
+    elif dc == "motion":
+        return f"{name}: {'SIM' if state == 'on' else 'NÃO'}"
+    return f"{name}: {'ON' if state == 'on' else 'OFF'}"
+
+
+def _compact_climate(name: str, state: str, attrs) -> str:
+    ct = attrs.get("current_temperature")
+    tt = attrs.get("temperature")
+    return f"{name}: {state} {'?' if ct is None else ct}°C" + (f"→{tt}°C" if tt else "")
+
+
+def _compact_cover(name: str, state: str, attrs) -> str:
+    pos = attrs.get("current_position")
+    return f"{name}: {state}" + (f" {pos}%" if pos else "")
+
+
+def _compact_lock(name: str, state: str, attrs) -> str:
+    return f"{name}: {'🔒' if state == 'locked' else '🔓'}"
+
+
+def _compact_media_player(name: str, state: str, attrs) -> str:
+    if state == "playing":
+        title = attrs.get("media_title")
+        return f"{name}: ▶️ {title}" if title else f"{name}: ▶️"
+    return f"{name}: {state}"
+
+
+_COMPACT_LINE_HANDLERS: dict[str, Callable[[str, str, Any], str]] = {
+    "light": _compact_light,
+    "sensor": _compact_sensor,
+    "binary_sensor": _compact_binary_sensor,
+    "climate": _compact_climate,
+    "cover": _compact_cover,
+    "lock": _compact_lock,
+    "media_player": _compact_media_player,
 }
 
+# Registry events that invalidate the entity -> area map
+REGISTRY_UPDATE_EVENTS = (
+    er.EVENT_ENTITY_REGISTRY_UPDATED,
+    dr.EVENT_DEVICE_REGISTRY_UPDATED,
+    ar.EVENT_AREA_REGISTRY_UPDATED,
+)
+
+_NO_AREA: tuple[None, None] = (None, None)
+
+# Entities without an area are listed up to this many per category
+MAX_UNASSIGNED_PER_CATEGORY = 10
+
+# Integer counters tallied for the quick summary
+QUICK_SUMMARY_COUNTERS = (
+    "lights_on",
+    "lights_total",
+    "open_covers",
+    "active_media",
+    "open_doors",
+    "open_windows",
+    "climate_active",
+)
+
 
 class HomeAwareness:
     """Provides comprehensive home awareness organized by areas/floors."""
@@ -53,6 +411,29 @@ class HomeAwareness:
         self._cache: dict[str, Any] = {}
         self._cache_time: datetime | None = None
         self._cache_ttl = timedelta(seconds=30)
+        # entity_id -> (area_id, area_name); rebuilt lazily after registry changes
+        self._entity_area_map: dict[str, tuple[str | None, str | None]] | None = None
+        # area_id -> entity_ids, built alongside the map above
+        self._area_entities: dict[str, list[str]] = {}
+        # area_name -> ((entity count, newest last_updated), joined summary line)
+        self._area_summary_cache: dict[str, tuple[tuple[int, float], str]] = {}
+        self._unsub_listeners: list[CALLBACK_TYPE] = [
+            hass.bus.async_listen(event_type, self._handle_registry_updated)
+            for event_type in REGISTRY_UPDATE_EVENTS
+        ]
+
+    def async_unload(self):
+        """Stop listening for registry updates."""
+        for unsub in self._unsub_listeners:
+            unsub()
+        self._unsub_listeners.clear()
+
+    @callback
+    def _handle_registry_updated(self, event: Event):
+        """Drop the entity -> area map and area summaries; rebuilt on next use."""
+        self._entity_area_map = None
+        # An entity swapped between areas can keep an area's cache key unchanged
+        self._area_summary_cache = {}
 
     def _is_cache_valid(self) -> bool:
         """Check if cache is still valid."""
@@ -69,31 +450,41 @@ class HomeAwareness:
             "floors": fr.async_get(self.hass),
         }
 
-    def _get_area_for_entity(
-        self,
-        entity_id: str,
-        entity_reg: er.EntityRegistry,
-        device_reg: dr.DeviceRegistry,
-        area_reg: ar.AreaRegistry,
-    ) -> tuple[str | None, str | None]:
-        """Get area ID and name for an entity."""
-        entry = entity_reg.async_get(entity_id)
-        if not entry:
-            return None, None
+    def _get_entity_area_map(self) -> dict[str, tuple[str | None, str | None]]:
+        """Get the entity_id -> (area ID, area name) map, building it if stale.
 
-        # Entity-level area assignment
-        if entry.area_id:
-            area = area_reg.async_get_area(entry.area_id)
-            return entry.area_id, area.name if area else None
+        Entities inherit their device's area unless they have their own
+        assignment. Entities without an area are left out of the map.
+        """
+        if self._entity_area_map is not None:
+            return self._entity_area_map
 
-        # Device-level area assignment
-        if entry.device_id:
-            device = device_reg.async_get(entry.device_id)
-            if device and device.area_id:
-                area = area_reg.async_get_area(device.area_id)
-                return device.area_id, area.name if area else None
+        regs = self._get_registries()
+        area_reg = regs["areas"]
+        device_reg = regs["devices"]
+        entity_reg = regs["entities"]
+
+        area_names = {area.id: area.name for area in area_reg.async_list_areas()}
+        area_map: dict[str, tuple[str | None, str | None]] = {}
+        area_entities: dict[str, list[str]] = defaultdict(list)
 
-        return None, None
+        for entry in entity_reg.entities.values():
+            area_id = entry.area_id
+            if not area_id and entry.device_id:
+                device = device_reg.async_get(entry.device_id)
+                area_id = device.area_id if device else None
+            if area_id:
+                area_map[entry.entity_id] = (area_id, area_names.get(area_id))
+                area_entities[area_id].append(entry.entity_id)
+
+        self._entity_area_map = area_map
+        self._area_entities = area_entities
+        return area_map
+
+    def _get_area_entity_ids(self, area_id: str) -> list[str]:
+        """Get the entity IDs assigned to an area, directly or via their device."""
+        self._get_entity_area_map()
+        return self._area_entities.get(area_id, [])
 
     def _get_floor_for_area(
         self,
@@ -112,308 +503,262 @@ class HomeAwareness:
     def _format_state(self, state: State) -> dict[str, Any]:
         """Format an entity state into a readable dict."""
         attrs = state.attributes
-        domain = state.entity_id.split(".")[0]
+        domain = state.domain
+        entity_id = state.entity_id
 
         info: dict[str, Any] = {
-            "entity_id": state.entity_id,
-            "name": attrs.get("friendly_name", state.entity_id),
+            "entity_id": entity_id,
+            "domain": domain,
+            "name": attrs.get("friendly_name", entity_id),
             "state": state.state,
         }
 
         # Add relevant attributes based on domain
-        if domain == "light":
-            if state.state == "on":
-                if "brightness" in attrs:
-                    info["brightness"] = round(attrs["brightness"] / 255 * 100)
-                if "color_temp_kelvin" in attrs:
-                    info["color_temp_kelvin"] = attrs["color_temp_kelvin"]
-                if "rgb_color" in attrs:
-                    info["rgb_color"] = attrs["rgb_color"]
-
-        elif domain == "climate":
-            info["current_temp"] = attrs.get("current_temperature")
-            info["target_temp"] = attrs.get("temperature")
-            info["hvac_mode"] = state.state
-            info["hvac_action"] = attrs.get("hvac_action")
-            if "humidity" in attrs:
-                info["humidity"] = attrs["humidity"]
-
-        elif domain == "cover":
-            if "current_position" in attrs:
-                info["position"] = attrs["current_position"]
-
-        elif domain == "media_player":
-            if state.state not in ("off", "unavailable", "unknown"):
-                info["media_title"] = attrs.get("media_title")
-                info["media_artist"] = attrs.get("media_artist")
-                info["source"] = attrs.get("source")
-                info["volume"] = attrs.get("volume_level")
-
-        elif domain == "sensor":
-            unit = attrs.get("unit_of_measurement", "")
-            if unit:
-                info["unit"] = unit
-            device_class = attrs.get("device_class", "")
-            if device_class:
-                info["device_class"] = device_class
-
-        elif domain == "binary_sensor":
-            device_class = attrs.get("device_class", "")
-            if device_class:
-                info["device_class"] = device_class
-
-        elif domain == "lock":
-            pass  # state is enough
-
-        elif domain == "alarm_control_panel":
-            info["code_arm_required"] = attrs.get("code_arm_required")
-
-        elif domain == "vacuum":
-            info["battery"] = attrs.get("battery_level")
-            info["status"] = attrs.get("status")
-
-        elif domain == "fan":
-            if state.state == "on":
-                info["speed"] = attrs.get("percentage")
-                info["preset_mode"] = attrs.get("preset_mode")
-
-        # Remove None values
-        return {k: v for k, v in info.items() if v is not None}
+        handler = _FORMAT_STATE_HANDLERS.get(domain)
+        if handler:
+            handler(state, attrs, info)
+
+        return info
 
     async def get_full_house_context(self) -> str:
         """Get complete house context organized by floors and areas."""
-        if self._is_cache_valid() and "full_context" in self._cache:
-            return self._cache["full_context"]
+        if not (self._is_cache_valid() and "full_context" in self._cache):
+            await self._rebuild_all()
+        return self._cache["full_context"]
 
+    async def _rebuild_all(self):
+        """Rebuild the full and summary contexts in a single pass over states."""
         regs = self._get_registries()
         area_reg = regs["areas"]
-        device_reg = regs["devices"]
-        entity_reg = regs["entities"]
         floor_reg = regs["floors"]
+        area_map = self._get_entity_area_map()
 
-        # Build structure: floor -> area -> category -> entities
-        house: dict[str, dict[str, dict[str, list]]] = defaultdict(
-            lambda: defaultdict(lambda: defaultdict(list))
-        )
+        # Build structure: floor -> area -> category -> entities, pre-seeded
+        # from the area registry so the hot loop only appends
+        house: dict[str, dict[str, dict[str, list]]] = {}
+        area_slots: dict[str, dict[str, list]] = {}
+        for area in area_reg.async_list_areas():
+            floor_id, floor_name = self._get_floor_for_area(
+                area.id, area_reg, floor_reg
+            )
+            areas = house.setdefault(floor_name or "Sem Piso", {})
+            area_slots[area.id] = areas.setdefault(
+                area.name, {category: [] for category in DOMAIN_CATEGORIES}
+            )
+        # Unassigned entities are only formatted up to the display limit,
+        # but counted in full
         unassigned: dict[str, list] = defaultdict(list)
+        unassigned_counts: dict[str, int] = defaultdict(int)
+        assigned_count = 0
+
+        # Summary view: area -> states, rendered lazily per area
+        area_states: dict[str, list[State]] = defaultdict(list)
+        no_area_states: list[str] = []
+
+        # Quick-summary accumulators, filled in the same pass: plain
+        # counters plus the few names the summary lists
+        counts = dict.fromkeys(QUICK_SUMMARY_COUNTERS, 0)
+        temps: list[tuple[str, float, str]] = []
+        motion_detected: list[str] = []
+        alarms: list[str] = []
 
         # Get all states
         all_states = self.hass.states.async_all()
 
         for state in all_states:
-            if state.state in ("unavailable", "unknown"):
+            st = state.state
+            if st in ("unavailable", "unknown"):
                 continue
 
-            domain = state.entity_id.split(".")[0]
-
-            # Skip less relevant domains
-            skip_domains = {
-                "persistent_notification", "zone", "sun", "weather",
-                "update", "button", "number", "select", "text",
-                "input_number", "input_select", "input_text", "input_datetime",
-                "scene", "group", "device_tracker", "person", "tts",
-                "stt", "conversation", "tag",
-            }
-            if domain in skip_domains:
-                continue
+            domain = state.domain
 
-            # For sensors, filter to important ones
-            if domain == "sensor":
-                device_class = state.attributes.get("device_class", "")
-                # Skip sensors without device_class or with unimportant classes
-                if device_class and device_class not in IMPORTANT_SENSOR_CLASSES:
-                    continue
-                # Skip if no unit and no device class (likely non-numeric)
-                if not device_class and not state.attributes.get("unit_of_measurement"):
-                    continue
+            # Skip less relevant domains and unimportant sensors.
+            # The summary filters are a subset of these.
+            if not FULL_CONTEXT_FILTERS.get(domain, _accept_any)(state):
+                continue
 
             # Get area
-            area_id, area_name = self._get_area_for_entity(
-                state.entity_id, entity_reg, device_reg, area_reg
-            )
+            area_id, area_name = area_map.get(state.entity_id, _NO_AREA)
 
             # Determine category
-            category = "outros"
-            for cat, domains in DOMAIN_CATEGORIES.items():
-                if domain in domains:
-                    category = cat
-                    break
+            category = DOMAIN_TO_CATEGORY.get(domain, "outros")
 
-            formatted = self._format_state(state)
-
-            if area_id and area_name:
-                # Get floor
-                floor_id, floor_name = self._get_floor_for_area(
-                    area_id, area_reg, floor_reg
-                )
-                floor_label = floor_name or "Sem Piso"
-                house[floor_label][area_name][category].append(formatted)
+            if area_name and area_id in area_slots:
+                area_slots[area_id][category].append(self._format_state(state))
+                assigned_count += 1
             else:
-                unassigned[category].append(formatted)
+                unassigned_counts[category] += 1
+                if unassigned_counts[category] <= MAX_UNASSIGNED_PER_CATEGORY:
+                    unassigned[category].append(self._format_state(state))
+
+            # Summary view
+            if SUMMARY_FILTERS.get(domain, _reject)(state):
+                if area_name:
+                    area_states[area_name].append(state)
+                else:
+                    no_area_states.append(self._state_to_compact_line(state))
 
-        # Build text output
-        output = self._build_context_text(house, unassigned)
+            # Update quick-summary counters
+            if domain == "light":
+                counts["lights_total"] += 1
+                if st == "on":
+                    counts["lights_on"] += 1
+
+            elif domain == "sensor":
+                if state.attributes.get("device_class") == "temperature":
+                    try:
+                        temps.append((
+                            area_name or state.attributes.get("friendly_name", state.entity_id),
+                            float(st),
+                            state.attributes.get("unit_of_measurement") or "°C",
+                        ))
+                    except (ValueError, TypeError):
+                        pass
 
-        # Cache it
-        self._cache["full_context"] = output
-        self._cache_time = dt_util.utcnow()
+            elif domain == "cover":
+                if st == "open":
+                    counts["open_covers"] += 1
+
+            elif domain == "media_player":
+                if st == "playing":
+                    counts["active_media"] += 1
+
+            elif domain == "binary_sensor":
+                if st == "on":
+                    device_class = state.attributes.get("device_class")
+                    if device_class == "door":
+                        counts["open_doors"] += 1
+                    elif device_class == "window":
+                        counts["open_windows"] += 1
+                    elif device_class == "motion":
+                        motion_detected.append(
+                            area_name or state.attributes.get("friendly_name", state.entity_id)
+                        )
+
+            elif domain == "climate":
+                if st != "off":
+                    counts["climate_active"] += 1
+
+            elif domain == "alarm_control_panel":
+                alarms.append(st)
+
+        # Drop areas and floors that ended up with no entities
+        house = {
+            floor_name: populated
+            for floor_name, areas in house.items()
+            if (populated := {
+                area_name: categories
+                for area_name, categories in areas.items()
+                if any(categories.values())
+            })
+        }
 
-        return output
+        quick_summary = self._format_quick_summary(
+            counts, temps, motion_detected, alarms
+        )
+        self._cache["full_context"] = "".join(self._iter_context_lines(
+            house, assigned_count, unassigned, unassigned_counts, quick_summary
+        ))
+        self._cache["summary"] = self._build_summary_text(area_states, no_area_states)
+        self._cache_time = dt_util.utcnow()
 
-    def _build_context_text(
+    def _iter_context_lines(
         self,
         house: dict[str, dict[str, dict[str, list]]],
+        assigned_count: int,
         unassigned: dict[str, list],
-    ) -> str:
-        """Build the context text from the organized structure."""
-        parts = []
+        unassigned_counts: dict[str, int],
+        summary: str,
+    ) -> Iterator[str]:
+        """Yield the context text chunks from the organized structure."""
+        entity_to_line = self._entity_to_line
 
         # Summary first
-        total_entities = sum(
-            len(entities)
-            for floor in house.values()
-            for area in floor.values()
-            for entities in area.values()
-        ) + sum(len(entities) for entities in unassigned.values())
+        unassigned_count = sum(unassigned_counts.values())
+        total_entities = assigned_count + unassigned_count
 
         total_areas = sum(len(areas) for areas in house.values())
         total_floors = len([f for f in house if f != "Sem Piso"])
 
-        parts.append(f"## 🏠 Visão Geral da Casa")
-        parts.append(f"Pisos: {total_floors} | Divisões: {total_areas} | Dispositivos ativos: {total_entities}")
-        parts.append("")
+        yield "## 🏠 Visão Geral da Casa\n"
+        yield f"Pisos: {total_floors} | Divisões: {total_areas} | Dispositivos ativos: {total_entities}\n"
 
         # Quick status summary
-        summary = self._build_quick_summary(house, unassigned)
         if summary:
-            parts.append(summary)
-            parts.append("")
-
-        # Detailed by floor and area
-        for floor_name in sorted(house.keys(), key=lambda x: (x == "Sem Piso", x)):
-            areas = house[floor_name]
-            if floor_name != "Sem Piso":
-                parts.append(f"### 🏢 {floor_name}")
-            else:
-                parts.append(f"### 📦 Sem Piso Atribuído")
+            yield f"\n{summary}\n"
 
-            for area_name in sorted(areas.keys()):
-                categories = areas[area_name]
-                parts.append(f"\n#### 🚪 {area_name}")
+        # Detailed by floor and area, sorted once as (floor, area) pairs
+        sorted_pairs = sorted(
+            ((floor_name, area_name) for floor_name, areas in house.items() for area_name in areas),
+            key=lambda fa: (fa[0] == "Sem Piso", fa[0], fa[1]),
+        )
+        last_floor = None
+        for floor_name, area_name in sorted_pairs:
+            if floor_name != last_floor:
+                last_floor = floor_name
+                if floor_name != "Sem Piso":
+                    yield f"\n### 🏢 {floor_name}"
+                else:
+                    yield "\n### 📦 Sem Piso Atribuído"
 
-                for category in DOMAIN_CATEGORIES:
-                    if category not in categories:
-                        continue
-                    entities = categories[category]
-                    if not entities:
-                        continue
+            categories = house[floor_name][area_name]
+            yield f"\n\n#### 🚪 {area_name}"
+
+            for category in DOMAIN_CATEGORIES:
+                entities = categories.get(category)
+                if not entities:
+                    continue
 
-                    parts.append(f"  **{category.capitalize()}:**")
-                    for entity in entities:
-                        line = self._entity_to_line(entity)
-                        parts.append(f"    - {line}")
+                yield f"\n  **{category.capitalize()}:**"
+                yield from (f"\n    - {entity_to_line(e)}" for e in entities)
 
         # Unassigned entities
         if unassigned:
-            unassigned_count = sum(len(e) for e in unassigned.values())
             if unassigned_count > 0:
-                parts.append(f"\n### 📦 Sem Divisão Atribuída ({unassigned_count} dispositivos)")
+                yield f"\n\n### 📦 Sem Divisão Atribuída ({unassigned_count} dispositivos)"
                 for category, entities in unassigned.items():
                     if not entities:
                         continue
-                    parts.append(f"  **{category.capitalize()}:**")
-                    for entity in entities[:10]:  # Limit unassigned
-                        line = self._entity_to_line(entity)
-                        parts.append(f"    - {line}")
-                    if len(entities) > 10:
-                        parts.append(f"    ... e mais {len(entities) - 10}")
-
-        return "\n".join(parts)
+                    yield f"\n  **{category.capitalize()}:**"
+                    yield from (f"\n    - {entity_to_line(e)}" for e in entities)
+                    hidden = unassigned_counts[category] - len(entities)
+                    if hidden > 0:
+                        yield f"\n    ... e mais {hidden}"
 
-    def _build_quick_summary(
+    def _format_quick_summary(
         self,
-        house: dict,
-        unassigned: dict,
+        counts: dict[str, int],
+        temps: list[tuple[str, float, str]],
+        motion_detected: list[str],
+        alarms: list[str],
     ) -> str:
-        """Build a quick summary of the house state."""
-        lights_on = 0
-        lights_total = 0
-        temps = []
-        open_covers = 0
-        active_media = 0
-        open_doors = 0
-        open_windows = 0
-        motion_detected = []
-        climate_active = 0
-        alarms = []
-
-        all_entities = []
-        for floor in house.values():
-            for area_name, categories in floor.items():
-                for entities in categories.values():
-                    for e in entities:
-                        all_entities.append({**e, "_area": area_name})
-        for entities in unassigned.values():
-            all_entities.extend(entities)
-
-        for entity in all_entities:
-            eid = entity.get("entity_id", "")
-            state = entity.get("state", "")
-            domain = eid.split(".")[0]
-            device_class = entity.get("device_class", "")
-            area = entity.get("_area", "")
-
-            if domain == "light":
-                lights_total += 1
-                if state == "on":
-                    lights_on += 1
-
-            elif domain == "sensor" and device_class == "temperature":
-                try:
-                    val = float(state)
-                    name = entity.get("name", eid)
-                    temps.append((area or name, val, entity.get("unit", "°C")))
-                except (ValueError, TypeError):
-                    pass
-
-            elif domain == "cover":
-                if state == "open":
-                    open_covers += 1
-
-            elif domain == "media_player" and state == "playing":
-                active_media += 1
-
-            elif domain == "binary_sensor":
-                if device_class == "door" and state == "on":
-                    open_doors += 1
-                elif device_class == "window" and state == "on":
-                    open_windows += 1
-                elif device_class == "motion" and state == "on":
-                    motion_detected.append(area or entity.get("name", ""))
-
-            elif domain == "climate" and state not in ("off", "unavailable"):
-                climate_active += 1
-
-            elif domain == "alarm_control_panel":
-                alarms.append(state)
-
-        summary_lines = ["**📊 Resumo Rápido:**"]
+        """Format the quick summary from counters gathered during collection."""
+        lights_on = counts["lights_on"]
+        lights_total = counts["lights_total"]
+        open_covers = counts["open_covers"]
+        active_media = counts["active_media"]
+        open_doors = counts["open_doors"]
+        open_windows = counts["open_windows"]
+        climate_active = counts["climate_active"]
+
+        buf = io.StringIO()
+        w = buf.write
 
         # Lights
-        summary_lines.append(f"  💡 Luzes: {lights_on}/{lights_total} ligadas")
+        w(f"**📊 Resumo Rápido:**\n  💡 Luzes: {lights_on}/{lights_total} ligadas")
 
         # Temperatures
         if temps:
             temp_parts = [f"{area}: {val}{unit}" for area, val, unit in temps[:8]]
-            summary_lines.append(f"  🌡️ Temperaturas: {', '.join(temp_parts)}")
+            w(f"\n  🌡️ Temperaturas: {', '.join(temp_parts)}")
 
         # Climate
         if climate_active:
-            summary_lines.append(f"  ❄️ Climatização: {climate_active} equipamento(s) ativo(s)")
+            w(f"\n  ❄️ Climatização: {climate_active} equipamento(s) ativo(s)")
 
         # Covers
         if open_covers:
-            summary_lines.append(f"  🪟 Estores/Portões abertos: {open_covers}")
+            w(f"\n  🪟 Estores/Portões abertos: {open_covers}")
 
         # Security
         security_parts = []
@@ -427,118 +772,27 @@ class HomeAwareness:
         if alarms:
             security_parts.append(f"alarme: {', '.join(set(alarms))}")
         if security_parts:
-            summary_lines.append(f"  🔒 Segurança: {'; '.join(security_parts)}")
+            w(f"\n  🔒 Segurança: {'; '.join(security_parts)}")
 
         # Media
         if active_media:
-            summary_lines.append(f"  🎵 Media: {active_media} a reproduzir")
+            w(f"\n  🎵 Media: {active_media} a reproduzir")
 
-        return "\n".join(summary_lines)
+        return buf.getvalue()
 
     def _entity_to_line(self, entity: dict) -> str:
         """Convert an entity dict to a readable line."""
         name = entity.get("name", entity.get("entity_id", "?"))
-        state = entity.get("state", "?")
         eid = entity.get("entity_id", "")
-        domain = eid.split(".")[0]
 
-        parts = [f"{name}"]
-
-        if domain == "light":
-            if state == "on":
-                brightness = entity.get("brightness")
-                parts.append(f"💡 ON" + (f" ({brightness}%)" if brightness else ""))
-            else:
-                parts.append("OFF")
-
-        elif domain == "climate":
-            current = entity.get("current_temp")
-            target = entity.get("target_temp")
-            action = entity.get("hvac_action", "")
-            parts.append(f"{state}")
-            if current:
-                parts.append(f"atual: {current}°C")
-            if target:
-                parts.append(f"alvo: {target}°C")
-            if action:
-                parts.append(f"({action})")
-
-        elif domain == "sensor":
-            unit = entity.get("unit", "")
-            parts.append(f"{state} {unit}".strip())
-
-        elif domain == "binary_sensor":
-            device_class = entity.get("device_class", "")
-            label_map = {
-                "door": ("🚪 Aberta", "🚪 Fechada"),
-                "window": ("🪟 Aberta", "🪟 Fechada"),
-                "motion": ("🏃 Movimento", "✨ Sem movimento"),
-                "occupancy": ("👤 Ocupado", "Desocupado"),
-                "smoke": ("🚨 FUMO!", "OK"),
-                "gas": ("🚨 GÁS!", "OK"),
-                "moisture": ("💧 Húmido", "Seco"),
-                "lock": ("🔓 Destrancada", "🔒 Trancada"),
-            }
-            if device_class in label_map:
-                label = label_map[device_class][0 if state == "on" else 1]
-                parts.append(label)
-            else:
-                parts.append("ON" if state == "on" else "OFF")
-
-        elif domain == "cover":
-            position = entity.get("position")
-            if position is not None:
-                parts.append(f"{state} ({position}%)")
-            else:
-                parts.append(state)
-
-        elif domain == "lock":
-            parts.append("🔒 Trancada" if state == "locked" else "🔓 Destrancada")
-
-        elif domain == "media_player":
-            if state == "playing":
-                title = entity.get("media_title", "")
-                artist = entity.get("media_artist", "")
-                if title:
-                    parts.append(f"▶️ {title}")
-                    if artist:
-                        parts.append(f"por {artist}")
-                else:
-                    parts.append("▶️ A reproduzir")
-            else:
-                parts.append(state)
-
-        elif domain == "vacuum":
-            battery = entity.get("battery")
-            status = entity.get("status", state)
-            parts.append(f"{status}")
-            if battery:
-                parts.append(f"🔋 {battery}%")
-
-        elif domain == "alarm_control_panel":
-            alarm_labels = {
-                "armed_home": "🟢 Armado (casa)",
-                "armed_away": "🔴 Armado (fora)",
-                "armed_night": "🟡 Armado (noite)",
-                "disarmed": "⚪ Desarmado",
-                "triggered": "🚨 DISPARADO!",
-                "arming": "⏳ A armar...",
-                "pending": "⏳ Pendente...",
-            }
-            parts.append(alarm_labels.get(state, state))
-
-        else:
-            parts.append(state)
-
-        parts.append(f"[{eid}]")
-        return " | ".join(parts)
+        handler = _LINE_HANDLERS.get(entity.get("domain", ""))
+        body = handler(entity) if handler else entity.get("state", "?")
+        return f"{name} | {body} | [{eid}]"
 
     async def get_area_context(self, area_name: str) -> str:
         """Get context for a specific area/room."""
         regs = self._get_registries()
         area_reg = regs["areas"]
-        device_reg = regs["devices"]
-        entity_reg = regs["entities"]
 
         # Find the area
         target_area = None
@@ -559,17 +813,13 @@ class HomeAwareness:
 
         # Get all entities in this area
         entities_in_area = []
-        all_states = self.hass.states.async_all()
+        get_state = self.hass.states.get
 
-        for state in all_states:
-            if state.state in ("unavailable", "unknown"):
+        for entity_id in self._get_area_entity_ids(target_area.id):
+            state = get_state(entity_id)
+            if state is None or state.state in ("unavailable", "unknown"):
                 continue
-
-            area_id, _ = self._get_area_for_entity(
-                state.entity_id, entity_reg, device_reg, area_reg
-            )
-            if area_id == target_area.id:
-                entities_in_area.append(self._format_state(state))
+            entities_in_area.append(self._format_state(state))
 
         if not entities_in_area:
             return f"Divisão '{target_area.name}' não tem dispositivos ativos."
@@ -609,116 +859,50 @@ class HomeAwareness:
 
     async def get_summary_context(self) -> str:
         """Get a compact summary suitable for every LLM call (token-efficient)."""
-        if self._is_cache_valid() and "summary" in self._cache:
-            return self._cache["summary"]
-
-        regs = self._get_registries()
-        area_reg = regs["areas"]
-        device_reg = regs["devices"]
-        entity_reg = regs["entities"]
-
-        # Build area -> key states mapping
-        area_states: dict[str, list[str]] = defaultdict(list)
-        no_area_states: list[str] = []
-
-        all_states = self.hass.states.async_all()
-
-        for state in all_states:
-            if state.state in ("unavailable", "unknown"):
-                continue
-
-            domain = state.entity_id.split(".")[0]
-
-            # Only include the most relevant domains for the summary
-            if domain not in (
-                "light", "climate", "cover", "lock", "alarm_control_panel",
-                "sensor", "binary_sensor", "media_player",
-            ):
-                continue
-
-            # Filter sensors to important ones
-            if domain == "sensor":
-                dc = state.attributes.get("device_class", "")
-                if dc not in ("temperature", "humidity", "power", "energy", "battery"):
-                    continue
+        if not (self._is_cache_valid() and "summary" in self._cache):
+            await self._rebuild_all()
+        return self._cache["summary"]
 
-            if domain == "binary_sensor":
-                dc = state.attributes.get("device_class", "")
-                if dc not in ("door", "window", "motion", "occupancy", "smoke", "gas"):
-                    continue
+    def _build_summary_text(
+        self,
+        area_states: dict[str, list[State]],
+        no_area_states: list[str],
+    ) -> str:
+        """Build the compact summary text, reusing unchanged area lines."""
+        buf = io.StringIO()
+        w = buf.write
+        w("## Casa - Estado Atual")
 
-            # Get area
-            area_id, area_name = self._get_area_for_entity(
-                state.entity_id, entity_reg, device_reg, area_reg
+        previous = self._area_summary_cache
+        area_cache: dict[str, tuple[tuple[int, float], str]] = {}
+        for area_name in sorted(area_states.keys()):
+            states = area_states[area_name]
+            # The count catches entities leaving the area, which would not
+            # advance the newest timestamp
+            key = (
+                len(states),
+                max(state.last_updated.timestamp() for state in states),
             )
-
-            formatted = self._format_state(state)
-            line = self._entity_to_compact_line(formatted)
-
-            if area_name:
-                area_states[area_name].append(line)
+            cached = previous.get(area_name)
+            if cached and cached[0] == key:
+                joined = cached[1]
             else:
-                no_area_states.append(line)
-
-        # Build compact output
-        parts = ["## Casa - Estado Atual"]
-
-        for area_name in sorted(area_states.keys()):
-            entities = area_states[area_name]
-            parts.append(f"\n**{area_name}:** {' | '.join(entities)}")
+                joined = " | ".join(map(self._state_to_compact_line, states))
+            area_cache[area_name] = (key, joined)
+            w(f"\n\n**{area_name}:** {joined}")
+        self._area_summary_cache = area_cache
 
         if no_area_states:
-            parts.append(f"\n**Outros:** {' | '.join(no_area_states[:15])}")
+            w(f"\n\n**Outros:** {' | '.join(no_area_states[:15])}")
 
-        result = "\n".join(parts)
-
-        self._cache["summary"] = result
-        self._cache_time = dt_util.utcnow()
+        return buf.getvalue()
 
-        return result
-
-    def _entity_to_compact_line(self, entity: dict) -> str:
+    def _state_to_compact_line(self, state: State) -> str:
         """Ultra-compact entity representation for token efficiency."""
-        name = entity.get("name", "?")
-        state = entity.get("state", "?")
-        eid = entity.get("entity_id", "")
-        domain = eid.split(".")[0]
-
-        if domain == "light":
-            b = entity.get("brightness", "")
-            return f"{name}: {'ON' + (f' {b}%' if b else '') if state == 'on' else 'OFF'}"
-
-        elif domain == "sensor":
-            unit = entity.get("unit", "")
-            return f"{name}: {state}{unit}"
-
-        elif domain == "binary_sensor":
-            dc = entity.get("device_class", "")
-            if dc in ("door", "window"):
-                return f"{name}: {'ABERTO' if state == 'on' else 'FECHADO'}"
-            elif dc == "motion":
-                return f"{name}: {'SIM' if state == 'on' else 'NÃO'}"
-            return f"{name}: {'ON' if state == 'on' else 'OFF'}"
-
-        elif domain == "climate":
-            ct = entity.get("current_temp", "?")
-            tt = entity.get("target_temp", "")
-            return f"{name}: {state} {ct}°C" + (f"→{tt}°C" if tt else "")
-
-        elif domain == "cover":
-            pos = entity.get("position", "")
-            return f"{name}: {state}" + (f" {pos}%" if pos else "")
-
-        elif domain == "lock":
-            return f"{name}: {'🔒' if state == 'locked' else '🔓'}"
-
-        elif domain == "alarm_control_panel":
-            return f"{name}: {state}"
-
-        elif domain == "media_player":
-            if state == "playing":
-                title = entity.get("media_title", "")
-                return f"{name}: ▶️ {title}" if title else f"{name}: ▶️"
-            return f"{name}: {state}"
-
-        return f"{name}: {state}"
+        attrs = state.attributes
+        name = attrs.get("friendly_name", state.entity_id)
+
+        handler = _COMPACT_LINE_HANDLERS.get(state.domain)
+        if handler:
+            return handler(name, state.state, attrs)
+        return f"{name}: {state.state}"
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-import json
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from collections import defaultdict, deque
+from functools import partial
+from typing import Any, Awaitable, Callable
 
 import aiohttp
+import orjson
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 
 from .const import (
     LLM_ANTHROPIC,
@@ -19,35 +25,239 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Fail fast on connect, but give long generations room. Replies are streamed,
+# so the read timeout only has to cover the wait for the first token (which
+# includes Ollama loading a model).
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(
+    total=120, connect=5, sock_connect=5, sock_read=60
+)
+
+# Prepended to the live house state sent alongside the system prompt
+HA_CONTEXT_HEADER = "## Estado atual da casa:\n"
+
+# Conversation history limits per phone; tokens are estimated as chars / 4
+HISTORY_MAX_MESSAGES = 20
+HISTORY_TOKEN_BUDGET = 4000
+_new_history = partial(deque, maxlen=HISTORY_MAX_MESSAGES)
+
+STORAGE_KEY_PREFIX = "mordomo_ha.history"
+STORAGE_VERSION = 1
+# Seconds to coalesce history writes after a conversation turn
+HISTORY_SAVE_DELAY = 10
+
+# Seconds a house context fetched through the context provider is reused
+CONTEXT_CACHE_TTL = 5
+
+# Pre-encoded JSON can be embedded as-is on orjson >= 3.9.15
+_JSON_FRAGMENT = getattr(orjson, "Fragment", None)
+
+
+class LLMApiError(Exception):
+    """Raised when an LLM API answers with a non-200 status."""
+
+    def __init__(self, status: int, text: str):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.text = text
+
 
 class BaseLLMProvider(ABC):
     """Base class for LLM providers."""
 
+    # Provider name used in log messages
+    name = "LLM"
+
     def __init__(self, api_key: str, model: str, api_url: str | None = None):
         self.api_key = api_key
         self.model = model
         self.api_url = api_url
-        self._conversation_history: dict[str, list[dict]] = {}
-
-    def get_history(self, phone: str) -> list[dict]:
-        """Get conversation history for a phone number."""
+        self._conversation_history: defaultdict[str, deque[dict]] = defaultdict(
+            _new_history
+        )
+        # Running token estimate per phone, so trimming never rescans history
+        self._history_tokens: defaultdict[str, int] = defaultdict(int)
+        self._session: aiohttp.ClientSession | None = None
+        self._store: Store | None = None
+        # Stored histories not yet accessed, by phone; None until loaded
+        self._stored: dict[str, list[dict]] | None = None
+        # (system prompt, its request block), built once per prompt
+        self._system_cache: tuple[str, Any] | None = None
+        self._context_provider: Callable[[], Awaitable[str]] | None = None
+        # (context text, monotonic expiry)
+        self._context_cache: tuple[str, float] | None = None
+
+    def set_context_provider(self, provider: Callable[[], Awaitable[str]]):
+        """Let chat() fetch the house context when the caller passes none.
+
+        The text is reused for CONTEXT_CACHE_TTL seconds.
+        """
+        self._context_provider = provider
+        self._context_cache = None
+
+    async def _get_ha_context(self) -> str:
+        """Get the house context from the context provider, cached briefly."""
+        if self._context_provider is None:
+            return ""
+
+        now = time.monotonic()
+        cached = self._context_cache
+        if cached is not None and now < cached[1]:
+            return cached[0]
+
+        text = await self._context_provider()
+        self._context_cache = (text, now + CONTEXT_CACHE_TTL)
+        return text
+
+    def _system_block(self, system_prompt: str) -> dict[str, Any]:
+        """Build the request block carrying the static system prompt."""
+        return {"role": "system", "content": system_prompt}
+
+    def _cached_system_block(self, system_prompt: str) -> Any:
+        """Return the system prompt block, encoded once while the prompt is unchanged."""
+        cached = self._system_cache
+        if cached is None or cached[0] != system_prompt:
+            block = self._system_block(system_prompt)
+            if _JSON_FRAGMENT is not None:
+                block = _JSON_FRAGMENT(orjson.dumps(block))
+            cached = self._system_cache = (system_prompt, block)
+        return cached[1]
+
+    async def _build_chat_messages(
+        self, message: str, system_prompt: str, phone: str, ha_context: str
+    ) -> list[Any]:
+        """Build a chat-style message list without touching the history.
+
+        The static prompt and history come first so the prefix stays
+        cacheable; the live house state goes right before the new message.
+        History is only updated once the provider has replied.
+        """
+        history = await self.get_history(phone)
+        context = (
+            ({"role": "system", "content": f"{HA_CONTEXT_HEADER}{ha_context}"},)
+            if ha_context
+            else ()
+        )
+        return [
+            self._cached_system_block(system_prompt),
+            *history,
+            *context,
+            {"role": "user", "content": message},
+        ]
+
+    def enable_persistence(self, hass: HomeAssistant, entry_id: str):
+        """Persist conversation history in HA storage for one config entry."""
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_PREFIX}.{entry_id}")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create a reusable aiohttp session (keeps connections alive)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20,
+                    limit_per_host=10,
+                    keepalive_timeout=75,
+                    ttl_dns_cache=300,
+                ),
+                timeout=DEFAULT_TIMEOUT,
+            )
+        return self._session
+
+    async def close(self):
+        """Close the HTTP session and flush pending history writes."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._store and self._stored is not None:
+            await self._store.async_save(self._data_to_save())
+
+    async def _async_load(self):
+        """Load stored histories once."""
+        if self._stored is None:
+            data = await self._store.async_load() if self._store else None
+            self._stored = (data or {}).get("history", {})
+
+    def _data_to_save(self) -> dict:
+        """Return the history data to persist."""
+        history = dict(self._stored or {})
+        for phone, messages in self._conversation_history.items():
+            if messages:
+                history[phone] = list(messages)
+        return {"history": history}
+
+    def _schedule_save(self):
+        """Save history after a short delay, coalescing bursts of messages."""
+        # Saving before the store is loaded would overwrite every stored history
+        if self._store and self._stored is not None:
+            self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    async def get_history(self, phone: str) -> deque[dict]:
+        """Get conversation history for a phone number, loading it on first use."""
+        history = self._conversation_history.get(phone)
+        if history is not None:
+            return history
+
+        await self._async_load()
+        # Another caller may have loaded this phone while we waited
         if phone not in self._conversation_history:
-            self._conversation_history[phone] = []
+            history = _new_history(self._stored.pop(phone, []))
+            self._conversation_history[phone] = history
+            self._history_tokens[phone] = sum(
+                len(msg["content"]) // 4 for msg in history
+            )
         return self._conversation_history[phone]
 
     def add_to_history(self, phone: str, role: str, content: str):
         """Add message to conversation history."""
-        history = self.get_history(phone)
+        history = self._conversation_history[phone]
+        tokens = self._history_tokens[phone] + len(content) // 4
+        if len(history) == history.maxlen:
+            # The deque evicts the oldest message on append
+            tokens -= len(history[0]["content"]) // 4
         history.append({"role": role, "content": content})
-        # Keep last 20 messages to manage context window
-        if len(history) > 20:
-            self._conversation_history[phone] = history[-20:]
 
-    def clear_history(self, phone: str):
+        # Drop the oldest messages to fit the token budget, keeping the newest
+        # one, and never start the history on an assistant reply (even if
+        # that leaves it empty)
+        while history and (
+            history[0]["role"] != "user"
+            or (len(history) > 1 and tokens > HISTORY_TOKEN_BUDGET)
+        ):
+            tokens -= len(history.popleft()["content"]) // 4
+        self._history_tokens[phone] = tokens
+        self._schedule_save()
+
+    async def clear_history(self, phone: str):
         """Clear conversation history for a phone number."""
-        self._conversation_history[phone] = []
+        # Load first so the stored copy is dropped and the others are kept
+        await self._async_load()
+        self._conversation_history[phone] = _new_history()
+        self._history_tokens[phone] = 0
+        self._stored.pop(phone, None)
+        self._schedule_save()
+
+    async def _post_stream(
+        self,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, Any],
+    ) -> str:
+        """POST a JSON payload and collect the streamed reply text."""
+        session = self._get_session()
+        parts: list[str] = []
+        async with session.post(
+            url, headers=headers, data=orjson.dumps(payload)
+        ) as resp:
+            if resp.status != 200:
+                raise LLMApiError(resp.status, await resp.text())
+            # Some compatible backends ignore "stream" and answer in one body
+            if resp.content_type == "application/json":
+                return self._parse_body(orjson.loads(await resp.read()))
+            async for line in resp.content:
+                line = line.strip()
+                if line and (text := self._parse_stream_line(line)):
+                    parts.append(text)
+        return "".join(parts)
 
-    @abstractmethod
     async def chat(
         self,
         message: str,
@@ -56,6 +266,42 @@ class BaseLLMProvider(ABC):
         ha_context: str = "",
     ) -> str:
         """Send a message and get a response."""
+        if not ha_context:
+            ha_context = await self._get_ha_context()
+        url, headers, payload = await self._build_request(
+            message, system_prompt, phone, ha_context
+        )
+
+        try:
+            response = await self._post_stream(url, headers, payload)
+        except LLMApiError as err:
+            _LOGGER.error("%s API error %s: %s", self.name, err.status, err.text)
+            return f"Desculpa, tive um erro ao processar: {err.status}"
+        except Exception as err:
+            _LOGGER.error("%s request failed: %s", self.name, err)
+            return "Desculpa, não consegui processar o teu pedido de momento."
+
+        if not response:
+            _LOGGER.error("%s returned empty content", self.name)
+            return "Desculpa, recebi uma resposta vazia do LLM."
+        # Only add to history after successful response
+        self.add_to_history(phone, "user", message)
+        self.add_to_history(phone, "assistant", response)
+        return response
+
+    @abstractmethod
+    async def _build_request(
+        self, message: str, system_prompt: str, phone: str, ha_context: str
+    ) -> tuple[str, dict[str, str], dict[str, Any]]:
+        """Build the URL, headers and payload for a chat request."""
+
+    @abstractmethod
+    def _parse_stream_line(self, line: bytes) -> str:
+        """Return the text carried by one non-empty line of the stream."""
+
+    @abstractmethod
+    def _parse_body(self, data: dict[str, Any]) -> str:
+        """Return the reply text of a non-streamed JSON response."""
 
 
 class OpenAIProvider(BaseLLMProvider):
@@ -66,22 +312,13 @@ class OpenAIProvider(BaseLLMProvider):
         if not self.api_url:
             self.api_url = "https://api.openai.com/v1"
 
-    async def chat(
-        self,
-        message: str,
-        system_prompt: str,
-        phone: str,
-        ha_context: str = "",
-    ) -> str:
-        """Send message via OpenAI-compatible API."""
-        full_system = system_prompt
-        if ha_context:
-            full_system += f"\n\n## Estado atual da casa:\n{ha_context}"
-
-        # Build messages with current history + new user message
-        messages = [{"role": "system", "content": full_system}]
-        messages.extend(self.get_history(phone))
-        messages.append({"role": "user", "content": message})
+    async def _build_request(
+        self, message: str, system_prompt: str, phone: str, ha_context: str
+    ) -> tuple[str, dict[str, str], dict[str, Any]]:
+        """Build an OpenAI-compatible chat completion request."""
+        messages = await self._build_chat_messages(
+            message, system_prompt, phone, ha_context
+        )
 
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -93,61 +330,64 @@ class OpenAIProvider(BaseLLMProvider):
             "messages": messages,
             "temperature": 0.7,
             "max_tokens": 2000,
+            "stream": True,
         }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.api_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=60),
-                ) as resp:
-                    if resp.status != 200:
-                        error_text = await resp.text()
-                        _LOGGER.error("LLM API error %s: %s", resp.status, error_text)
-                        return f"Desculpa, tive um erro ao processar: {resp.status}"
-
-                    data = await resp.json()
-                    choices = data.get("choices", [])
-                    if not choices:
-                        _LOGGER.error("LLM returned empty choices: %s", data)
-                        return "Desculpa, recebi uma resposta vazia do LLM."
-                    response = choices[0].get("message", {}).get("content", "")
-                    if not response:
-                        return "Desculpa, recebi uma resposta vazia do LLM."
-                    # Only add to history after successful response
-                    self.add_to_history(phone, "user", message)
-                    self.add_to_history(phone, "assistant", response)
-                    return response
-
-        except Exception as err:
-            _LOGGER.error("LLM request failed: %s", err)
-            return "Desculpa, não consegui processar o teu pedido de momento."
+        return f"{self.api_url}/chat/completions", headers, payload
+
+    def _parse_stream_line(self, line: bytes) -> str:
+        # Server-sent events: "data: {...}" frames, ending with "data: [DONE]"
+        if not line.startswith(b"data:"):
+            return ""
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            return ""
+        chunk = orjson.loads(data)
+        if "error" in chunk:
+            raise RuntimeError(f"stream error: {chunk['error']}")
+        choices = chunk.get("choices")
+        if not choices:
+            return ""
+        return choices[0].get("delta", {}).get("content") or ""
+
+    def _parse_body(self, data: dict[str, Any]) -> str:
+        choices = data.get("choices")
+        if not choices:
+            _LOGGER.error("LLM returned empty choices: %s", data)
+            return ""
+        return choices[0].get("message", {}).get("content") or ""
 
 
 class AnthropicProvider(BaseLLMProvider):
     """Anthropic Claude provider."""
 
+    name = "Anthropic"
+
     def __init__(self, api_key: str, model: str, api_url: str | None = None):
         super().__init__(api_key, model, api_url)
         self.api_url = api_url or "https://api.anthropic.com/v1"
 
-    async def chat(
-        self,
-        message: str,
-        system_prompt: str,
-        phone: str,
-        ha_context: str = "",
-    ) -> str:
-        """Send message via Anthropic API."""
-        full_system = system_prompt
+    def _system_block(self, system_prompt: str) -> dict[str, Any]:
+        """Build the system text block, marked for prompt caching."""
+        return {
+            "type": "text",
+            "text": system_prompt,
+            "cache_control": {"type": "ephemeral"},
+        }
+
+    async def _build_request(
+        self, message: str, system_prompt: str, phone: str, ha_context: str
+    ) -> tuple[str, dict[str, str], dict[str, Any]]:
+        """Build an Anthropic messages request."""
+        # The static prompt is its own cached block; the house state varies
+        system: list[Any] = [self._cached_system_block(system_prompt)]
         if ha_context:
-            full_system += f"\n\n## Estado atual da casa:\n{ha_context}"
+            system.append({"type": "text", "text": f"{HA_CONTEXT_HEADER}{ha_context}"})
 
         # Build messages with current history + new user message
-        chat_messages = list(self.get_history(phone))
-        chat_messages.append({"role": "user", "content": message})
+        chat_messages = [
+            *await self.get_history(phone),
+            {"role": "user", "content": message},
+        ]
 
         headers = {
             "x-api-key": self.api_key,
@@ -157,114 +397,94 @@ class AnthropicProvider(BaseLLMProvider):
 
         payload = {
             "model": self.model,
-            "system": full_system,
+            "system": system,
             "messages": chat_messages,
             "max_tokens": 2000,
             "temperature": 0.7,
+            "stream": True,
         }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.api_url}/messages",
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=60),
-                ) as resp:
-                    if resp.status != 200:
-                        error_text = await resp.text()
-                        _LOGGER.error("Anthropic API error %s: %s", resp.status, error_text)
-                        return f"Desculpa, tive um erro ao processar: {resp.status}"
-
-                    data = await resp.json()
-                    content = data.get("content", [])
-                    if not content:
-                        _LOGGER.error("Anthropic returned empty content: %s", data)
-                        return "Desculpa, recebi uma resposta vazia do LLM."
-                    response = content[0].get("text", "")
-                    if not response:
-                        return "Desculpa, recebi uma resposta vazia do LLM."
-                    # Only add to history after successful response
-                    self.add_to_history(phone, "user", message)
-                    self.add_to_history(phone, "assistant", response)
-                    return response
-
-        except Exception as err:
-            _LOGGER.error("Anthropic request failed: %s", err)
-            return "Desculpa, não consegui processar o teu pedido de momento."
+        return f"{self.api_url}/messages", headers, payload
+
+    def _parse_stream_line(self, line: bytes) -> str:
+        # Server-sent events; text arrives in content_block_delta frames
+        if not line.startswith(b"data:"):
+            return ""
+        event = orjson.loads(line[5:])
+        event_type = event.get("type")
+        if event_type == "content_block_delta":
+            return event.get("delta", {}).get("text", "")
+        if event_type == "error":
+            raise RuntimeError(f"stream error: {event.get('error')}")
+        return ""
+
+    def _parse_body(self, data: dict[str, Any]) -> str:
+        return "".join(
+            block.get("text", "")
+            for block in data.get("content", [])
+            if block.get("type") == "text"
+        )
 
 
 class OllamaProvider(BaseLLMProvider):
     """Ollama local provider."""
 
+    name = "Ollama"
+
     def __init__(self, api_key: str, model: str, api_url: str | None = None):
         super().__init__(api_key, model, api_url)
         self.api_url = api_url or "http://localhost:11434"
 
-    async def chat(
-        self,
-        message: str,
-        system_prompt: str,
-        phone: str,
-        ha_context: str = "",
-    ) -> str:
-        """Send message via Ollama API."""
-        full_system = system_prompt
-        if ha_context:
-            full_system += f"\n\n## Estado atual da casa:\n{ha_context}"
-
-        # Build messages with current history + new user message
-        messages = [{"role": "system", "content": full_system}]
-        messages.extend(self.get_history(phone))
-        messages.append({"role": "user", "content": message})
+    async def _build_request(
+        self, message: str, system_prompt: str, phone: str, ha_context: str
+    ) -> tuple[str, dict[str, str], dict[str, Any]]:
+        """Build an Ollama chat request."""
+        messages = await self._build_chat_messages(
+            message, system_prompt, phone, ha_context
+        )
 
         payload = {
             "model": self.model,
             "messages": messages,
-            "stream": False,
+            "stream": True,
         }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.api_url}/api/chat",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=120),
-                ) as resp:
-                    if resp.status != 200:
-                        error_text = await resp.text()
-                        _LOGGER.error("Ollama API error %s: %s", resp.status, error_text)
-                        return f"Desculpa, tive um erro ao processar: {resp.status}"
-
-                    data = await resp.json()
-                    msg_data = data.get("message", {})
-                    response = msg_data.get("content", "") if isinstance(msg_data, dict) else ""
-                    if not response:
-                        _LOGGER.error("Ollama returned empty content: %s", data)
-                        return "Desculpa, recebi uma resposta vazia do LLM."
-                    # Only add to history after successful response
-                    self.add_to_history(phone, "user", message)
-                    self.add_to_history(phone, "assistant", response)
-                    return response
-
-        except Exception as err:
-            _LOGGER.error("Ollama request failed: %s", err)
-            return "Desculpa, não consegui processar o teu pedido de momento."
+        return (
+            f"{self.api_url}/api/chat",
+            {"Content-Type": "application/json"},
+            payload,
+        )
+
+    def _parse_stream_line(self, line: bytes) -> str:
+        # Newline-delimited JSON objects
+        chunk = orjson.loads(line)
+        if "error" in chunk:
+            raise RuntimeError(f"stream error: {chunk['error']}")
+        return self._parse_body(chunk)
+
+    def _parse_body(self, data: dict[str, Any]) -> str:
+        msg_data = data.get("message", {})
+        return msg_data.get("content", "") if isinstance(msg_data, dict) else ""
+
+
+# Provider constant -> factory taking (api_key, model, api_url)
+_PROVIDERS: dict[str, Callable[[str, str, str | None], BaseLLMProvider]] = {
+    LLM_OPENAI: lambda key, model, url: OpenAIProvider(key, model),
+    LLM_ANTHROPIC: lambda key, model, url: AnthropicProvider(key, model),
+    LLM_DEEPSEEK: lambda key, model, url: OpenAIProvider(
+        key, model, "https://api.deepseek.com/v1"
+    ),
+    LLM_OLLAMA: lambda key, model, url: OllamaProvider(
+        "", model, url or "http://localhost:11434"
+    ),
+    LLM_CUSTOM: lambda key, model, url: OpenAIProvider(key, model, url),
+}
 
 
 def create_llm_provider(
     provider: str, api_key: str, model: str, api_url: str | None = None
 ) -> BaseLLMProvider:
     """Factory to create the appropriate LLM provider."""
-    if provider == LLM_OPENAI:
-        return OpenAIProvider(api_key, model)
-    elif provider == LLM_ANTHROPIC:
-        return AnthropicProvider(api_key, model)
-    elif provider == LLM_DEEPSEEK:
-        return OpenAIProvider(api_key, model, "https://api.deepseek.com/v1")
-    elif provider == LLM_OLLAMA:
-        return OllamaProvider("", model, api_url or "http://localhost:11434")
-    elif provider == LLM_CUSTOM:
-        return OpenAIProvider(api_key, model, api_url)
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider}")
+    try:
+        factory = _PROVIDERS[provider]
+    except KeyError:
+        raise ValueError(f"Unknown LLM provider: {provider}") from None
+    return factory(api_key, model, api_url)
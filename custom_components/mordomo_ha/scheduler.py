@@ -2,21 +2,57 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import uuid
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
 
-from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+try:
+    from croniter import croniter
+except ImportError:
+    croniter = None
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
+from .const import DOMAIN
+
 _LOGGER = logging.getLogger(__name__)
 
 STORAGE_KEY = "mordomo_ha.scheduler"
 STORAGE_VERSION = 1
+# Seconds to coalesce saves after jobs fire
+SAVE_DELAY = 10.0
+# Timers cancelled between event loop yields during unload
+UNLOAD_YIELD_EVERY = 100
+
+
+def is_valid_cron(cron_expression: str) -> bool:
+    """Check a cron expression (only its field count without croniter)."""
+    if croniter is None:
+        return len(cron_expression.split()) == 5
+    return croniter.is_valid(cron_expression)
+
+
+def _to_primitive(value: Any) -> Any:
+    """Convert a command result into JSON-friendly primitives for the event bus."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): _to_primitive(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_to_primitive(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, State):
+        return value.entity_id
+    return str(value)
 
 
 class CronJob:
@@ -42,6 +78,8 @@ class CronJob:
         self.last_run: datetime | None = None
         self.next_run: datetime | None = None
         self._cancel_callback: CALLBACK_TYPE | None = None
+        # Parsed cron expression, reused across reschedules
+        self._cron_iter: croniter | None = None
 
     def to_dict(self) -> dict:
         """Serialize to dict."""
@@ -56,9 +94,16 @@ class CronJob:
             "last_run": self.last_run.isoformat() if self.last_run else None,
         }
 
+    def to_storage(self) -> dict:
+        """Serialize for the job store, with last_run as epoch seconds."""
+        data = self.to_dict()
+        if self.last_run:
+            data["last_run"] = int(self.last_run.timestamp())
+        return data
+
     @classmethod
     def from_dict(cls, data: dict) -> CronJob:
-        """Deserialize from dict."""
+        """Deserialize from dict (last_run as epoch seconds or ISO string)."""
         job = cls(
             job_id=data["job_id"],
             cron_expression=data["cron_expression"],
@@ -68,8 +113,11 @@ class CronJob:
             enabled=data.get("enabled", True),
             one_shot=data.get("one_shot", False),
         )
-        if data.get("last_run"):
-            job.last_run = datetime.fromisoformat(data["last_run"])
+        last_run = data.get("last_run")
+        if isinstance(last_run, (int, float)):
+            job.last_run = datetime.fromtimestamp(last_run, tz=dt_util.DEFAULT_TIME_ZONE)
+        elif last_run:
+            job.last_run = datetime.fromisoformat(last_run)
         return job
 
 
@@ -95,6 +143,8 @@ class MordomoScheduler:
                 try:
                     job = CronJob.from_dict(job_data)
                     self._jobs[job.job_id] = job
+                    if job.enabled and not is_valid_cron(job.cron_expression):
+                        self._disable_invalid_job(job)
                     if job.enabled:
                         await self._schedule_next_run(job)
                 except Exception as err:
@@ -114,12 +164,43 @@ class MordomoScheduler:
             )
         )
 
+    def _data_to_save(self) -> dict:
+        """Return the jobs data to persist."""
+        return {
+            "jobs": [job.to_storage() for job in self._jobs.values()],
+        }
+
+    def _disable_invalid_job(self, job: CronJob):
+        """Disable a stored job with a bad cron expression and raise a repair issue."""
+        _LOGGER.error(
+            "Job '%s' has an invalid cron expression '%s', disabling it",
+            job.job_id,
+            job.cron_expression,
+        )
+        job.enabled = False
+        self._async_schedule_save()
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            f"invalid_cron_{job.job_id}",
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="invalid_cron",
+            translation_placeholders={
+                "job_id": job.job_id,
+                "description": job.description,
+                "cron": job.cron_expression,
+            },
+        )
+
     async def async_save(self):
         """Save jobs to storage."""
-        data = {
-            "jobs": [job.to_dict() for job in self._jobs.values()],
-        }
-        await self._store.async_save(data)
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _async_schedule_save(self):
+        """Save jobs after a short delay, coalescing bursts of job runs."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
 
     async def async_unload(self):
         """Unload scheduler: cancel all timers and event listeners."""
@@ -128,11 +209,14 @@ class MordomoScheduler:
             unsub()
         self._unsub_listeners.clear()
 
-        # Cancel scheduled timers
-        for job in self._jobs.values():
+        # Cancel scheduled timers, yielding to the event loop now and then.
+        # Iterate over a copy since jobs may change while we yield.
+        for count, job in enumerate(list(self._jobs.values()), 1):
             if job._cancel_callback:
                 job._cancel_callback()
                 job._cancel_callback = None
+            if count % UNLOAD_YIELD_EVERY == 0:
+                await asyncio.sleep(0)
 
     async def add_job(
         self,
@@ -143,6 +227,9 @@ class MordomoScheduler:
         one_shot: bool = False,
     ) -> CronJob:
         """Add a new scheduled job."""
+        if not is_valid_cron(cron_expression):
+            raise ValueError(f"Invalid cron expression: {cron_expression}")
+
         job_id = str(uuid.uuid4())[:8]
         job = CronJob(
             job_id=job_id,
@@ -168,6 +255,7 @@ class MordomoScheduler:
 
         if job._cancel_callback:
             job._cancel_callback()
+        ir.async_delete_issue(self.hass, DOMAIN, f"invalid_cron_{job_id}")
 
         await self.async_save()
         _LOGGER.info("Removed job '%s'", job_id)
@@ -179,12 +267,18 @@ class MordomoScheduler:
 
     async def _schedule_next_run(self, job: CronJob):
         """Calculate and schedule the next run for a job."""
-        try:
-            from croniter import croniter
+        if croniter is None:
+            _LOGGER.error("croniter not installed, using simple interval fallback")
+            await self._schedule_simple_fallback(job)
+            return
 
+        try:
             now = dt_util.now()
-            cron = croniter(job.cron_expression, now)
-            next_time = cron.get_next(datetime)
+            if job._cron_iter is None:
+                job._cron_iter = croniter(job.cron_expression, now)
+            else:
+                job._cron_iter.set_current(now, force=True)
+            next_time = job._cron_iter.get_next(datetime)
 
             # Attach the local timezone without converting (croniter already
             # computed in local time because 'now' was tz-aware local).
@@ -200,7 +294,7 @@ class MordomoScheduler:
             # Schedule execution
             job._cancel_callback = async_track_point_in_time(
                 self.hass,
-                lambda now, j=job: self.hass.async_create_task(self._run_job(j)),
+                partial(self._fire_job, job),
                 next_time,
             )
 
@@ -208,19 +302,11 @@ class MordomoScheduler:
                 "Job '%s' scheduled for %s", job.job_id, next_time.isoformat()
             )
 
-        except ImportError:
-            _LOGGER.error("croniter not installed, using simple interval fallback")
-            await self._schedule_simple_fallback(job)
         except Exception as err:
             _LOGGER.error("Failed to schedule job '%s': %s", job.job_id, err)
 
     async def _schedule_simple_fallback(self, job: CronJob):
         """Simple fallback scheduler when croniter is not available."""
-        parts = job.cron_expression.split()
-        if len(parts) != 5:
-            _LOGGER.error("Invalid cron expression: %s", job.cron_expression)
-            return
-
         # Very basic: schedule 1 hour from now as fallback
         next_time = dt_util.now() + timedelta(hours=1)
         job.next_run = next_time
@@ -230,10 +316,15 @@ class MordomoScheduler:
 
         job._cancel_callback = async_track_point_in_time(
             self.hass,
-            lambda now, j=job: self.hass.async_create_task(self._run_job(j)),
+            partial(self._fire_job, job),
             next_time,
         )
 
+    @callback
+    def _fire_job(self, job: CronJob, _now: datetime):
+        """Start a job when its scheduled time arrives."""
+        self.hass.async_create_task(self._run_job(job))
+
     async def _run_job(self, job: CronJob):
         """Execute a scheduled job."""
         _LOGGER.info("Running job '%s': %s", job.job_id, job.description)
@@ -242,7 +333,9 @@ class MordomoScheduler:
 
         if self._command_processor and job.commands:
             try:
-                results = await self._command_processor.execute_commands(job.commands)
+                results = await self._command_processor.execute_commands(
+                    job.commands, parallel=True
+                )
                 _LOGGER.info("Job '%s' results: %s", job.job_id, results)
 
                 self.hass.bus.async_fire(
@@ -250,7 +343,12 @@ class MordomoScheduler:
                     {
                         "job_id": job.job_id,
                         "description": job.description,
-                        "results": results,
+                        # Results are normally strings already; anything
+                        # else is flattened once here
+                        "results": [
+                            result if isinstance(result, str) else _to_primitive(result)
+                            for result in results
+                        ],
                     },
                 )
             except Exception as err:
@@ -261,15 +359,19 @@ class MordomoScheduler:
             await self.remove_job(job.job_id)
         else:
             await self._schedule_next_run(job)
-            await self.async_save()
+            self._async_schedule_save()
 
     @callback
     def _handle_schedule_event(self, event):
         """Handle schedule job event."""
         data = event.data
+        cron_expression = data.get("cron", "")
+        if not is_valid_cron(cron_expression):
+            _LOGGER.error("Ignoring job with invalid cron expression '%s'", cron_expression)
+            return
         self.hass.async_create_task(
             self.add_job(
-                cron_expression=data.get("cron", ""),
+                cron_expression=cron_expression,
                 description=data.get("description", ""),
                 commands=data.get("commands", []),
                 created_by=data.get("created_by", "whatsapp"),
@@ -9,13 +9,64 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import shutil
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
 from enum import Enum
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Any
 
 import aiohttp
+import orjson
 
 _LOGGER = logging.getLogger(__name__)
 
+# Characters dropped from phone numbers before sending
+_STRIP = str.maketrans("", "", "+ ")
+
+# Bodies are pre-encoded with orjson, so the content type is set by hand
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Read-only default for nested webhook lookups (avoids allocating {} per call)
+_EMPTY = MappingProxyType({})
+
+# Fields read from webhook payloads in one C-level lookup
+_BRIDGE_MESSAGE_FIELDS = itemgetter("from", "message")
+_EVOLUTION_KEY_FIELDS = itemgetter("fromMe", "remoteJid")
+
+# HTTP statuses that mean a message was accepted
+_OK = frozenset({200, 201})
+
+# How long to wait for the bridge HTTP API after spawning it, and poll interval
+BRIDGE_READY_TIMEOUT = 10.0
+BRIDGE_READY_POLL = 0.1
+# Bytes read from the bridge output per await
+LOG_READ_CHUNK = 65536
+# StreamReader buffer limit for the bridge output (pipe is paused at 2x this)
+LOG_READER_LIMIT = 1 << 20
+# The bridge is local: bound connect and each read, no overall request timer
+BRIDGE_TIMEOUT = aiohttp.ClientTimeout(sock_connect=2, sock_read=30)
+# Read-only probes (status/QR) back dashboard views, so keep them short
+BRIDGE_PROBE_TIMEOUT = aiohttp.ClientTimeout(total=5)
+# Concurrent outgoing sends per gateway (share the session's keep-alive pool)
+SEND_WORKERS = 4
+# Seconds allowed for `npm install`, and stderr lines kept for the error log
+NPM_INSTALL_TIMEOUT = 120
+NPM_ERROR_TAIL = 5
+# Bridge files shipped with the integration
+BRIDGE_DIR = os.path.join(os.path.dirname(__file__), "bridge")
+BRIDGE_SCRIPT = os.path.join(BRIDGE_DIR, "baileys_bridge.js")
+BRIDGE_NODE_MODULES = os.path.join(BRIDGE_DIR, "node_modules")
+# Host environment variables forwarded to the bridge (when set)
+_BRIDGE_ENV_PASSTHROUGH = (
+    "PATH", "HOME", "TZ", "LANG", "NODE_OPTIONS", "NODE_EXTRA_CA_CERTS",
+    "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY",
+)
+
+# Set once `node --version` succeeded, so bridge restarts skip the check
+_NODE_VERIFIED = False
+
 
 class WhatsAppGateway(str, Enum):
     """Supported WhatsApp connection methods."""
@@ -33,6 +84,106 @@ GATEWAY_LABELS = {
 }
 
 
+async def _iter_lines(stream: asyncio.StreamReader) -> AsyncIterator[str]:
+    """Yield the non-empty lines of a subprocess stream, reading in chunks."""
+    buffer = bytearray()
+    while chunk := await stream.read(LOG_READ_CHUNK):
+        buffer += chunk
+        *lines, rest = buffer.split(b"\n")
+        buffer = bytearray(rest)
+        for line in lines:
+            if text := line.decode("utf-8", errors="replace").strip():
+                yield text
+    if text := buffer.decode("utf-8", errors="replace").strip():
+        yield text
+
+
+async def _drain_npm_output(stream: asyncio.StreamReader, tail: deque[str] | None = None):
+    """Log npm output at debug level, keeping the last lines in ``tail``."""
+    async for text in _iter_lines(stream):
+        _LOGGER.debug("[npm] %s", text)
+        if tail is not None:
+            tail.append(text)
+
+
+class _SendQueue:
+    """Queue of outgoing messages drained by a fixed pool of workers."""
+
+    def __init__(self, send: Callable[[str, str], Awaitable[bool]]):
+        self._send = send
+        self._queue: asyncio.Queue[tuple[str, str, asyncio.Future]] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+
+    async def submit(self, to: str, message: str) -> bool:
+        """Queue a message and wait for its send result."""
+        loop = asyncio.get_running_loop()
+        if not self._workers:
+            self._workers = [
+                loop.create_task(self._worker()) for _ in range(SEND_WORKERS)
+            ]
+        future = loop.create_future()
+        self._queue.put_nowait((to, message, future))
+        return await future
+
+    async def _worker(self):
+        """Send queued messages one at a time."""
+        while True:
+            to, message, future = await self._queue.get()
+            try:
+                if not future.done():
+                    result = await self._send(to, message)
+                    if not future.done():
+                        future.set_result(result)
+            except asyncio.CancelledError:
+                # Stopped mid-send: don't leave the caller waiting forever
+                if not future.done():
+                    future.set_result(False)
+                raise
+            except Exception as err:
+                _LOGGER.error("Queued send failed: %s", err)
+                if not future.done():
+                    future.set_result(False)
+            finally:
+                self._queue.task_done()
+
+    async def stop(self):
+        """Stop the workers and fail anything still queued."""
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_result(False)
+
+
+async def _async_check_node() -> bool:
+    """Check that Node.js runs, only spawning `node --version` once."""
+    global _NODE_VERIFIED
+    if _NODE_VERIFIED:
+        return True
+    if shutil.which("node") is None:
+        _LOGGER.error("Node.js not found. Install Node.js >= 18 to use Baileys.")
+        return False
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "node", "--version",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        await asyncio.wait_for(proc.communicate(), timeout=5)
+        if proc.returncode != 0:
+            _LOGGER.error("Node.js not found")
+            return False
+    except (FileNotFoundError, asyncio.TimeoutError):
+        _LOGGER.error("Node.js not found. Install Node.js >= 18 to use Baileys.")
+        return False
+    _NODE_VERIFIED = True
+    return True
+
+
 class BaileysDirectGateway:
     """Direct WhatsApp Web connection via Baileys (same as OpenClaw).
 
@@ -50,60 +201,39 @@ class BaileysDirectGateway:
         self._process: asyncio.subprocess.Process | None = None
         self._running = False
         self._session: aiohttp.ClientSession | None = None
+        self._sender = _SendQueue(self._do_send)
+        # Set once node_modules is known to exist, skipping the check on restarts
+        self._deps_installed = False
 
     def _get_session(self) -> aiohttp.ClientSession:
         """Get or create a reusable aiohttp session."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
+            self._session = aiohttp.ClientSession(timeout=BRIDGE_TIMEOUT)
         return self._session
 
     async def start_bridge(self) -> bool:
         """Start the Baileys bridge subprocess (non-blocking)."""
-        bridge_dir = os.path.join(os.path.dirname(__file__), "bridge")
-        bridge_script = os.path.join(bridge_dir, "baileys_bridge.js")
-        node_modules = os.path.join(bridge_dir, "node_modules")
-
         # Check Node.js (non-blocking)
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                "node", "--version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=5)
-            if proc.returncode != 0:
-                _LOGGER.error("Node.js not found")
-                return False
-        except (FileNotFoundError, asyncio.TimeoutError):
-            _LOGGER.error("Node.js not found. Install Node.js >= 18 to use Baileys.")
+        if not await _async_check_node():
             return False
 
         # npm install if needed (non-blocking)
-        if not os.path.exists(node_modules):
+        if not self._deps_installed and not os.path.isdir(BRIDGE_NODE_MODULES):
             _LOGGER.info("Installing Baileys bridge dependencies...")
-            try:
-                proc = await asyncio.create_subprocess_exec(
-                    "npm", "install", "--production",
-                    cwd=bridge_dir,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
-                if proc.returncode != 0:
-                    _LOGGER.error("npm install failed: %s", stderr.decode())
-                    return False
-            except Exception as err:
-                _LOGGER.error("npm install error: %s", err)
+            if not await self._npm_install():
                 return False
+        self._deps_installed = True
 
         if not self.auth_dir:
-            self.auth_dir = os.path.join(bridge_dir, "auth")
+            self.auth_dir = os.path.join(BRIDGE_DIR, "auth")
         os.makedirs(self.auth_dir, exist_ok=True)
 
-        env = os.environ.copy()
+        env = {
+            key: os.environ[key] for key in _BRIDGE_ENV_PASSTHROUGH
+            if key in os.environ
+        }
         env.update({
+            "NODE_ENV": "production",
             "MORDOMO_AUTH_DIR": self.auth_dir,
             "MORDOMO_WEBHOOK_URL": self.webhook_url,
             "MORDOMO_BRIDGE_PORT": str(self.bridge_port),
@@ -113,18 +243,18 @@ class BaileysDirectGateway:
 
         try:
             self._process = await asyncio.create_subprocess_exec(
-                "node", bridge_script,
-                cwd=bridge_dir,
+                "node", BRIDGE_SCRIPT,
+                cwd=BRIDGE_DIR,
                 env=env,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.STDOUT,
+                limit=LOG_READER_LIMIT,
             )
             self._running = True
             # Start log reading as a background task
             asyncio.get_running_loop().create_task(self._read_logs_async())
-            await asyncio.sleep(3)
 
-            if self._process.returncode is not None:
+            if not await self._wait_until_ready():
                 _LOGGER.error("Bridge exited immediately")
                 return False
 
@@ -134,24 +264,82 @@ class BaileysDirectGateway:
             _LOGGER.error("Bridge start failed: %s", err)
             return False
 
+    async def _npm_install(self) -> bool:
+        """Run `npm install`, streaming its output to the debug log."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "npm", "install", "--production",
+                cwd=BRIDGE_DIR,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except Exception as err:
+            _LOGGER.error("npm install error: %s", err)
+            return False
+
+        stderr_tail: deque[str] = deque(maxlen=NPM_ERROR_TAIL)
+        loop = asyncio.get_running_loop()
+        drains = [
+            loop.create_task(_drain_npm_output(proc.stdout)),
+            loop.create_task(_drain_npm_output(proc.stderr, stderr_tail)),
+        ]
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=NPM_INSTALL_TIMEOUT)
+        except asyncio.TimeoutError:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            for task in drains:
+                task.cancel()
+            _LOGGER.error("npm install timed out after %ds", NPM_INSTALL_TIMEOUT)
+            return False
+        finally:
+            await asyncio.gather(*drains, return_exceptions=True)
+
+        if proc.returncode != 0:
+            _LOGGER.error("npm install failed: %s", "\n".join(stderr_tail))
+            return False
+        return True
+
+    async def _wait_until_ready(self) -> bool:
+        """Poll /status until the bridge answers; False if the process died."""
+        session = self._get_session()
+        poll_timeout = aiohttp.ClientTimeout(total=0.3)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + BRIDGE_READY_TIMEOUT
+        while loop.time() < deadline:
+            await asyncio.sleep(BRIDGE_READY_POLL)
+            if self._process.returncode is not None:
+                return False
+            try:
+                async with session.get(f"{self.bridge_url}/status",
+                                       timeout=poll_timeout) as resp:
+                    if resp.status == 200:
+                        return True
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+        # Still starting on a slow host; the process is alive so carry on
+        _LOGGER.warning("Bridge not answering after %.0fs, continuing anyway",
+                        BRIDGE_READY_TIMEOUT)
+        return self._process.returncode is None
+
     async def _read_logs_async(self):
         """Read bridge logs asynchronously."""
         if not self._process or not self._process.stdout:
             return
         try:
-            while self._running:
-                line = await self._process.stdout.readline()
-                if not line:
+            async for text in _iter_lines(self._process.stdout):
+                if not self._running:
                     break
-                text = line.decode('utf-8', errors='replace').strip()
-                if text:
-                    _LOGGER.info("[baileys] %s", text)
+                _LOGGER.info("[baileys] %s", text)
         except Exception:
             pass
 
     async def stop_bridge(self):
         """Stop the bridge subprocess (non-blocking)."""
         self._running = False
+        await self._sender.stop()
         # Close the shared HTTP session
         if self._session and not self._session.closed:
             await self._session.close()
@@ -169,15 +357,18 @@ class BaileysDirectGateway:
             self._process = None
 
     async def send_message(self, to: str, message: str) -> bool:
+        return await self._sender.submit(to, message)
+
+    async def _do_send(self, to: str, message: str) -> bool:
         try:
             session = self._get_session()
             async with session.post(f"{self.bridge_url}/send",
-                json={"to": to, "message": message},
-                timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                if resp.status != 200:
-                    _LOGGER.error("Bridge send error: %s", await resp.text())
-                    return False
-                return True
+                headers=_JSON_HEADERS,
+                data=orjson.dumps({"to": to, "message": message})) as resp:
+                if resp.status in _OK:
+                    return True
+                _LOGGER.error("Bridge send error: %s", await resp.text(errors="replace"))
+                return False
         except aiohttp.ClientError as err:
             _LOGGER.error("Bridge send failed: %s", err)
             return False
@@ -186,9 +377,12 @@ class BaileysDirectGateway:
         try:
             session = self._get_session()
             async with session.post(f"{self.bridge_url}/send-image",
-                json={"to": to, "image_url": image_url, "caption": caption},
-                timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                return resp.status == 200
+                headers=_JSON_HEADERS,
+                data=orjson.dumps({"to": to, "image_url": image_url, "caption": caption})) as resp:
+                if resp.status in _OK:
+                    return True
+                _LOGGER.error("Bridge send image error: %s", await resp.text(errors="replace"))
+                return False
         except aiohttp.ClientError as err:
             _LOGGER.error("Bridge send image failed: %s", err)
             return False
@@ -197,9 +391,9 @@ class BaileysDirectGateway:
         try:
             session = self._get_session()
             async with session.get(f"{self.bridge_url}/status",
-                timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                                   timeout=BRIDGE_PROBE_TIMEOUT) as resp:
                 if resp.status == 200:
-                    return await resp.json()
+                    return await resp.json(loads=orjson.loads)
         except Exception:
             pass
         return {"status": "bridge_unreachable"}
@@ -208,9 +402,9 @@ class BaileysDirectGateway:
         try:
             session = self._get_session()
             async with session.get(f"{self.bridge_url}/qr",
-                timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                                   timeout=BRIDGE_PROBE_TIMEOUT) as resp:
                 if resp.status == 200:
-                    return await resp.json()
+                    return await resp.json(loads=orjson.loads)
         except Exception:
             pass
         return {"status": "bridge_unreachable"}
@@ -218,18 +412,19 @@ class BaileysDirectGateway:
     async def logout(self) -> bool:
         try:
             session = self._get_session()
-            async with session.post(f"{self.bridge_url}/logout",
-                timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            async with session.post(f"{self.bridge_url}/logout") as resp:
                 return resp.status == 200
         except Exception:
             return False
 
     def parse_webhook(self, data: dict) -> dict | None:
-        if "from" not in data or "message" not in data:
+        try:
+            sender, message = _BRIDGE_MESSAGE_FIELDS(data)
+        except KeyError:
             return None
         return {
-            "from": data["from"],
-            "message": data["message"],
+            "from": sender,
+            "message": message,
             "type": data.get("type", "text"),
             "is_group": data.get("isGroup", False),
             "raw": data,
@@ -244,74 +439,140 @@ class ExternalGateway:
         self.api_url = api_url.rstrip("/")
         self.api_key = api_key
         self.phone_id = phone_id
+        self._session: aiohttp.ClientSession | None = None
+
+        # Headers and send URL only depend on the config, build them once
+        self._headers: dict[str, str] = {"Content-Type": "application/json"}
+        self._send_url = ""
+        if gateway_type == "evolution_api":
+            self._headers["apikey"] = api_key
+            self._send_url = f"{self.api_url}/message/sendText/{phone_id}"
+        elif gateway_type == "waha":
+            if api_key:
+                self._headers["Authorization"] = f"Bearer {api_key}"
+            self._send_url = f"{self.api_url}/api/sendText"
+        elif gateway_type == "meta_cloud":
+            self._headers["Authorization"] = f"Bearer {api_key}"
+            self._send_url = f"{self.api_url}/{phone_id}/messages"
+        self._sender = _SendQueue(self._do_send)
+
+        # Per-gateway handlers, picked once instead of branching on every call
+        self._build_payload: Callable[[str, str], dict] | None = {
+            "evolution_api": self._payload_evolution,
+            "waha": self._payload_waha,
+            "meta_cloud": self._payload_meta,
+        }.get(gateway_type)
+        self._parse: Callable[[dict], dict | None] | None = {
+            "evolution_api": self._parse_evolution,
+            "waha": self._parse_waha,
+            "meta_cloud": self._parse_meta,
+        }.get(gateway_type)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create a reusable aiohttp session (keeps connections alive)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(
+                    limit=20, ttl_dns_cache=300, keepalive_timeout=75
+                ),
+            )
+        return self._session
+
+    async def close(self):
+        """Stop the send workers and close the shared HTTP session."""
+        await self._sender.stop()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def send_message(self, to: str, message: str) -> bool:
-        number = to.replace("+", "").replace(" ", "")
+        return await self._sender.submit(to, message)
+
+    async def _do_send(self, to: str, message: str) -> bool:
+        if self._build_payload is None:
+            return False
         try:
-            async with aiohttp.ClientSession() as session:
-                if self.gateway_type == "evolution_api":
-                    headers = {"apikey": self.api_key, "Content-Type": "application/json"}
-                    url = f"{self.api_url}/message/sendText/{self.phone_id}"
-                    payload = {"number": number, "text": message}
-                elif self.gateway_type == "waha":
-                    headers = {"Content-Type": "application/json"}
-                    if self.api_key:
-                        headers["Authorization"] = f"Bearer {self.api_key}"
-                    url = f"{self.api_url}/api/sendText"
-                    payload = {"chatId": f"{number}@c.us", "text": message,
-                               "session": self.phone_id or "default"}
-                elif self.gateway_type == "meta_cloud":
-                    headers = {"Authorization": f"Bearer {self.api_key}",
-                               "Content-Type": "application/json"}
-                    url = f"{self.api_url}/{self.phone_id}/messages"
-                    payload = {"messaging_product": "whatsapp", "to": number,
-                               "type": "text", "text": {"body": message}}
-                else:
-                    return False
-
-                async with session.post(url, headers=headers, json=payload) as resp:
-                    return resp.status in (200, 201)
+            payload = self._build_payload(to.translate(_STRIP), message)
+            session = self._get_session()
+            async with session.post(self._send_url, headers=self._headers,
+                                    data=orjson.dumps(payload)) as resp:
+                if resp.status in _OK:
+                    return True
+                _LOGGER.error("Gateway send error (%s): %s", resp.status,
+                              await resp.text(errors="replace"))
+                return False
         except Exception as err:
             _LOGGER.error("Gateway send failed: %s", err)
             return False
 
+    def _payload_evolution(self, number: str, message: str) -> dict:
+        return {"number": number, "text": message}
+
+    def _payload_waha(self, number: str, message: str) -> dict:
+        return {"chatId": f"{number}@c.us", "text": message,
+                "session": self.phone_id or "default"}
+
+    def _payload_meta(self, number: str, message: str) -> dict:
+        return {"messaging_product": "whatsapp", "to": number,
+                "type": "text", "text": {"body": message}}
+
     async def send_image(self, to: str, image_url: str, caption: str = "") -> bool:
         return False
 
     def parse_webhook(self, data: dict) -> dict | None:
+        if self._parse is None:
+            return None
         try:
-            if self.gateway_type == "evolution_api":
-                event = data.get("event", "")
-                if event not in ("messages.upsert", "MESSAGES_UPSERT"):
-                    return None
-                msg_data = data.get("data", {})
-                key = msg_data.get("key", {})
-                if key.get("fromMe", False):
-                    return None
-                phone = key.get("remoteJid", "").split("@")[0]
-                mc = msg_data.get("message", {})
-                text = mc.get("conversation", "") or mc.get("extendedTextMessage", {}).get("text", "")
-                return {"from": phone, "message": text, "type": "text", "raw": msg_data} if text else None
-            elif self.gateway_type == "waha":
-                if data.get("event") != "message":
-                    return None
-                p = data.get("payload", {})
-                if p.get("fromMe"):
-                    return None
-                phone = p.get("from", "").replace("@c.us", "")
-                text = p.get("body", "")
-                return {"from": phone, "message": text, "type": "text", "raw": p} if text else None
-            elif self.gateway_type == "meta_cloud":
-                msgs = data.get("entry", [{}])[0].get("changes", [{}])[0].get("value", {}).get("messages", [])
-                if not msgs:
-                    return None
-                m = msgs[0]
-                return {"from": m["from"], "message": m.get("text", {}).get("body", ""),
-                        "type": m.get("type", "text"), "raw": m}
+            return self._parse(data)
         except Exception as err:
             _LOGGER.error("Webhook parse error: %s", err)
         return None
 
+    @staticmethod
+    def _parse_evolution(data: dict) -> dict | None:
+        event = data.get("event", "")
+        if event not in ("messages.upsert", "MESSAGES_UPSERT"):
+            return None
+        msg_data = data.get("data", _EMPTY)
+        key = msg_data.get("key", _EMPTY)
+        try:
+            from_me, remote_jid = _EVOLUTION_KEY_FIELDS(key)
+        except KeyError:
+            from_me, remote_jid = key.get("fromMe", False), key.get("remoteJid", "")
+        if from_me:
+            return None
+        phone = remote_jid.partition("@")[0]
+        mc = msg_data.get("message", _EMPTY)
+        text = mc.get("conversation") or mc.get("extendedTextMessage", _EMPTY).get("text", "")
+        return {"from": phone, "message": text, "type": "text", "raw": msg_data} if text else None
+
+    @staticmethod
+    def _parse_waha(data: dict) -> dict | None:
+        if data.get("event") != "message":
+            return None
+        p = data.get("payload", _EMPTY)
+        if p.get("fromMe"):
+            return None
+        phone = p.get("from", "").partition("@")[0]
+        text = p.get("body", "")
+        return {"from": phone, "message": text, "type": "text", "raw": p} if text else None
+
+    @staticmethod
+    def _parse_meta(data: dict) -> dict | None:
+        entry = data.get("entry")
+        if not entry:
+            return None
+        changes = entry[0].get("changes")
+        if not changes:
+            return None
+        msgs = changes[0].get("value", _EMPTY).get("messages")
+        if not msgs:
+            return None
+        m = msgs[0]
+        return {"from": m["from"], "message": m.get("text", _EMPTY).get("body", ""),
+                "type": m.get("type", "text"), "raw": m}
+
 
 def create_whatsapp_gateway(
     gateway_type: str, api_url: str = "", api_key: str = "", phone_id: str = "",